@@ -5,6 +5,8 @@
      • rgba(int,int,int,float)
      • hsla(int,int,int,float)
      • hexa(str)
+     • ColorArray(colors)
+     • Palette(colors)
   • PATH OPERATIONS          xx.Path
   • FILE OPERATIONS          xx.File
   • JSON FILE OPERATIONS     xx.Json
@@ -0,0 +1,299 @@
+"""
+Reproducible benchmarks for the `FormatCodes` hot path and the color types, run with the `xx-bench` command:
+- `xx-bench` (run all workloads and compare them to the saved baseline, if there is one)
+- `xx-bench --save` (run all workloads and save the results as the new baseline)
+- `xx-bench --only short_log,hex_colors` (only run some of the workloads)
+- `xx-bench --size 10` (the size of the big document workload in MB)
+- `xx-bench --repeat 5` (how often each workload is timed, the fastest time counts)
+- `xx-bench --baseline path/to/baseline.json` (where the baseline is saved and read from, `./.xx-bench.json` by default)
+- `xx-bench --tolerance 0.15` (how much slower than the baseline a workload may be, before it counts as a regression)
+
+Besides the times, the memory (in bytes) a single `rgba()`, `hsla()` and `hexa()` color object takes up and the time
+(in µs) a single `Color.to_rgba()`, `Color.to_hsla()` or `Color.to_hexa()` conversion takes for each input type are
+measured and compared to the baseline the same way.
+"""
+
+from . import __version__
+from ._consts_ import DEFAULT
+from .xx_format_codes import FormatCodes
+from .xx_console import Console
+from .xx_color import rgba, hsla, hexa, ColorArray, Palette, Color
+
+import tracemalloc as _tracemalloc
+import platform as _platform
+import random as _random
+import timeit as _timeit
+import json as _json
+import sys as _sys
+import os as _os
+
+BASELINE_FILE = ".xx-bench.json"
+COLORS = list(DEFAULT.color.values())
+
+
+def _to_ansi(strings: list[str], **kwargs) -> callable:
+    """Returns a function, which converts all `strings` with `FormatCodes.to_ansi()` once."""
+    FormatCodes.to_ansi(strings[0], **kwargs)  # WARM UP THE PARSER AND THE LOOKUP TABLES
+    return lambda: [FormatCodes.to_ansi(string, **kwargs) for string in strings]
+
+
+def _short_log(_: float) -> callable:
+    """Many short log lines, like `Console.log()` creates them, each converted on its own."""
+    return _to_ansi(
+        [f"  [bold][_color] INFO: [_]\t[{DEFAULT.text_color}]processed item [b]({i}) of [i]1000[_]" for i in range(1000)],
+        default_color=DEFAULT.text_color,
+    )
+
+
+def _auto_reset(_: float) -> callable:
+    """Lines with many auto-reset texts, some of them nested and some escaped."""
+    return _to_ansi(
+        [
+            f"[b](bold [i](italic [u](underlined {i}))) [dim]/(not reset) [#F87](colored [bg:red](on red)) [_]"
+            for i in range(500)
+        ]
+    )
+
+
+def _deep_nesting(_: float) -> callable:
+    """Deeply nested formats inside auto-reset texts and nested brackets inside the formats."""
+    nested = "".join(f"[{'biu'[i % 3]}](" for i in range(30)) + "x" + ")" * 30
+    return _to_ansi([nested, "[[b](x)|" * 20 + "i" + "]" * 20] * 20)
+
+
+def _hex_colors(_: float) -> callable:
+    """Many different HEX and RGB colors, more than fit into the format key cache."""
+    rng = _random.Random(0)
+    return _to_ansi(
+        [
+            f"[#{rng.randrange(1 << 24):06X}]a[BG:#{rng.randrange(1 << 24):06X}]b[rgb({rng.randrange(256)},0,0)]c[_]"
+            for _ in range(2000)
+        ]
+    )
+
+
+def _modifiers(_: float) -> callable:
+    """Lines full of the `default_color` brightness modifiers and resets."""
+    return _to_ansi(
+        ["[l]a[ll](b)[d]c[--](d)[BG:+]e[*]f [*color]g [default]h[_]" for _ in range(500)],
+        default_color=COLORS[0],
+        brightness_steps=15,
+    )
+
+
+def _document(size: float) -> callable:
+    """A single big multi-line document of `size` MB, converted in one call."""
+    line = "[b|#F87](Hello) [i]world[_] [bg:red]x[_bg] [dim](y [u](z)) 'quoted [text]' and some plain text\n"
+    return _to_ansi([line * max(1, int(size * 1_000_000 / len(line)))])
+
+
+def _random_channels(amount: int) -> list[tuple[int, int, int]]:
+    rng = _random.Random(0)
+    return [(rng.randrange(256), rng.randrange(256), rng.randrange(256)) for _ in range(amount)]
+
+
+def _color_objects(_: float) -> callable:
+    """Creating many `rgba()`, `hsla()` and `hexa()` colors, like palette generation does it."""
+    channels = _random_channels(10_000)
+    hex_strings = [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in channels]
+    return lambda: (
+        [rgba(r, g, b, 0.5) for r, g, b in channels],
+        [hsla(r * 360 // 255, g * 100 // 255, b * 100 // 255) for r, g, b in channels],
+        [hexa(hex_str) for hex_str in hex_strings],
+    )
+
+
+def _color_chains(_: float) -> callable:
+    """Chained color operations, which each create new color objects in between."""
+    colors = [rgba(r, g, b) for r, g, b in _random_channels(2_000)]
+    return lambda: [
+        (color.lighten(0.2).rotate(30).to_hexa(), color.to_hsla().darken(0.1).blend((0, 100, 50)), color.invert())
+        for color in colors
+    ]
+
+
+def _color_array(_: float) -> callable:
+    """The same kind of color operations, but run on a whole `ColorArray` at once."""
+    colors = ColorArray(rgba(r, g, b) for r, g, b in _random_channels(20_000))
+    return lambda: (colors.lighten(0.2).rotate(30), colors.blend((0, 0, 255)), colors.luminance(), colors.to_hexa())
+
+
+def _palette(_: float) -> callable:
+    """Finding the nearest colors in a big palette, like mapping user colors to brand colors does it."""
+    palette = Palette(rgba(r, g, b) for r, g, b in _random_channels(4_096))
+    colors = [rgba(b, g, r) for r, g, b in _random_channels(2_000)]
+    return lambda: [palette.nearest(color, 3) for color in colors]
+
+
+def _gradients(_: float) -> callable:
+    """Many gradients with multiple color stops, like heat-map legends and banners need them."""
+    colors = [rgba(r, g, b) for r, g, b in _random_channels(500)]
+    stops = [colors[i : i + 5] for i in range(0, 500, 5)]
+    return lambda: [Color.gradient_stops(stop_colors, 1000, space) for stop_colors in stops for space in ("rgb", "hsl")]
+
+
+def _contrast(_: float) -> callable:
+    """Checking the WCAG contrast of many foreground and background color pairs, like accessibility audits do it."""
+    channels = _random_channels(100_000)
+    fg, bg = ColorArray(rgba(r, g, b) for r, g, b in channels), ColorArray(rgba(b, r, g) for r, g, b in channels)
+    return lambda: Color.contrast_ratio_many(fg, bg)
+
+
+def _hex_literals(_: float) -> callable:
+    """Parsing the same few hundred HEX colors over and over again, like loading many config files does it."""
+    literals = [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in _random_channels(300)]
+    strings = [literals[i * 7919 % 300] for i in range(100_000)]
+    return lambda: [Color.to_rgba(string) for string in strings]
+
+
+def _color_scan(size: float) -> callable:
+    """Finding all the colors inside a CSS file of `size` MB with `Color.iter_colors()`."""
+    line = ".x { color: rgb(12, 34, 56); background: #FFAA00; border: 1px solid hsla(200, 50%, 40%, 0.5) }\n"
+    css = (line * max(1, int(size * 1_000_000 / len(line)))).encode()
+    return lambda: sum(1 for _ in Color.iter_colors(css))
+
+
+WORKLOADS = {
+    "short_log": _short_log,
+    "auto_reset": _auto_reset,
+    "deep_nesting": _deep_nesting,
+    "hex_colors": _hex_colors,
+    "modifiers": _modifiers,
+    "document": _document,
+    "color_objects": _color_objects,
+    "color_chains": _color_chains,
+    "color_array": _color_array,
+    "palette": _palette,
+    "gradients": _gradients,
+    "contrast": _contrast,
+    "hex_literals": _hex_literals,
+    "color_scan": _color_scan,
+}
+
+
+def run_benchmarks(names: list[str] = None, size: float = 10, repeat: int = 3) -> dict[str, float]:
+    """Runs the workloads and returns the fastest time (in seconds) of running each workload once."""
+    return {name: min(_timeit.Timer(WORKLOADS[name](size)).repeat(repeat=repeat, number=1)) for name in names or WORKLOADS}
+
+
+def measure_memory(amount: int = 10_000) -> dict[str, float]:
+    """Returns the memory (in bytes) a single `rgba()`, `hsla()` and `hexa()` color object takes up on average."""
+    channels = _random_channels(amount)
+    results, cache_size = {}, hexa.cache_info().maxsize
+    hexa.set_cache_size(0)  # THE INTERNING CACHE WOULD OTHERWISE BE COUNTED AS PART OF THE `hexa()` OBJECTS
+    for name, create in (
+        ("rgba", lambda r, g, b: rgba(r, g, b, 0.5)),
+        ("hsla", lambda r, g, b: hsla(r * 360 // 255, g * 100 // 255, b * 100 // 255, 0.5)),
+        ("hexa", lambda r, g, b: hexa(f"#{r:02X}{g:02X}{b:02X}80")),
+    ):
+        _tracemalloc.start()
+        start = _tracemalloc.get_traced_memory()[0]
+        colors = [create(r, g, b) for r, g, b in channels]
+        results[name] = (_tracemalloc.get_traced_memory()[0] - start) / amount
+        _tracemalloc.stop()
+        del colors
+    hexa.set_cache_size(cache_size)
+    return results
+
+
+def measure_conversions(amount: int = 2_000, repeat: int = 3) -> dict[str, float]:
+    """Returns the time (in seconds) a single `Color.to_rgba()`, `Color.to_hsla()` or `Color.to_hexa()` conversion takes
+    on average for each input type."""
+    channels = _random_channels(amount)
+    inputs = {
+        "rgba": [rgba(r, g, b) for r, g, b in channels],
+        "hsla": [hsla(r * 360 // 255, g * 100 // 255, b * 100 // 255) for r, g, b in channels],
+        "hexa": [hexa(f"#{r:02X}{g:02X}{b:02X}") for r, g, b in channels],
+        "rgb_tuple": [(r, g, b) for r, g, b in channels],
+        "hsl_tuple": [(r * 360 // 255, g * 100 // 255, b * 100 // 255) for r, g, b in channels],
+        "rgb_dict": [{"r": r, "g": g, "b": b} for r, g, b in channels],
+        "rgb_str": [f"rgb({r}, {g}, {b})" for r, g, b in channels],
+        "hex_str": [f"#{r:02X}{g:02X}{b:02X}" for r, g, b in channels],
+        "hex_int": [(r << 16) | (g << 8) | b for r, g, b in channels],
+    }
+    conversions = (Color.to_rgba, Color.to_hsla, Color.to_hexa)
+    return {
+        name: min(
+            _timeit.Timer(lambda: [convert(color) for convert in conversions for color in colors]).repeat(repeat, number=1)
+        )
+        / (len(conversions) * amount)
+        for name, colors in inputs.items()
+    }
+
+
+def compare(results: dict[str, float], baseline: dict[str, float], tolerance: float = 0.15) -> dict[str, float]:
+    """Returns the time ratio `result / baseline` of all workloads, which are slower than the baseline plus `tolerance`."""
+    return {
+        name: seconds / baseline[name]
+        for name, seconds in results.items()
+        if baseline.get(name) and seconds / baseline[name] > 1 + tolerance
+    }
+
+
+def _print_results(results: dict[str, float], baseline: dict[str, float], tolerance: float, unit: str, scale: float) -> int:
+    """Prints one line per result, compared to its baseline, and returns the number of regressions."""
+    regressions = compare(results, baseline, tolerance)
+    for name, value in results.items():
+        line = f"  {name:<14}{value * scale:>11.2f} {unit}"
+        if baseline.get(name):
+            ratio = value / baseline[name]
+            color = "#FF606A" if name in regressions else "#7EE787" if ratio < 1 - tolerance else "#B6B7C0"
+            line += f"  [{color}]{ratio:>6.2f}×[_]  [dim](baseline: {baseline[name] * scale:.2f} {unit})"
+        FormatCodes.print(line)
+    return len(regressions)
+
+
+def bench_command():
+    """Run the `FormatCodes` and color benchmarks, save them as baseline or compare them to the saved baseline."""
+    args = Console.get_args(
+        {
+            "save": ["--save", "-s"],
+            "only": ["--only", "-o"],
+            "size": ["--size"],
+            "repeat": ["--repeat", "-r"],
+            "baseline": ["--baseline", "-b"],
+            "tolerance": ["--tolerance", "-t"],
+        }
+    )
+    names = str(args["only"]["value"]).split(",") if args["only"]["value"] else list(WORKLOADS)
+    if unknown := [name for name in names if name not in WORKLOADS]:
+        FormatCodes.print(f"[b|#FF606A]Unknown workloads:[_] {', '.join(unknown)}  [dim](available: {', '.join(WORKLOADS)})")
+        _sys.exit(2)
+    baseline_file = str(args["baseline"]["value"] or BASELINE_FILE)
+    tolerance = float(args["tolerance"]["value"] or 0.15)
+    baseline = {}
+    if _os.path.isfile(baseline_file) and not args["save"]["exists"]:
+        with open(baseline_file, "r", encoding="utf-8") as file:
+            baseline = _json.load(file)
+
+    size = 10 if args["size"]["value"] is None else float(args["size"]["value"])
+    results = run_benchmarks(names, size, int(args["repeat"]["value"] or 3))
+    memory = measure_memory()
+    conversions = measure_conversions()
+    FormatCodes.print(f"\n  [b]xulbux v{__version__}[_]  [dim](Python {_platform.python_version()})\n")
+    regressions = _print_results(results, baseline.get("results", {}), tolerance, "ms", 1000)
+    FormatCodes.print()
+    regressions += _print_results(memory, baseline.get("memory", {}), tolerance, "B", 1)
+    FormatCodes.print()
+    regressions += _print_results(conversions, baseline.get("conversions", {}), tolerance, "µs", 1_000_000)
+
+    if args["save"]["exists"]:
+        with open(baseline_file, "w", encoding="utf-8") as file:
+            _json.dump(
+                {
+                    "version": __version__,
+                    "python": _platform.python_version(),
+                    "platform": _platform.platform(),
+                    "results": results,
+                    "memory": memory,
+                    "conversions": conversions,
+                },
+                file,
+                indent=2,
+            )
+        FormatCodes.print(f"\n  [#7EE787]Saved the results as baseline to[_] {baseline_file}\n")
+    elif regressions:
+        FormatCodes.print(f"\n  [b|#FF606A]{regressions} benchmark(s) got worse than the baseline![_]\n")
+        _sys.exit(1)
+    else:
+        FormatCodes.print()
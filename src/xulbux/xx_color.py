@@ -7,6 +7,10 @@
     Also includes an optional 4th param, which is a float, that represents the alpha channel (`0.0`-`1.0`).
 `hexa`:
     A HEX color: is a string in the format `RGB`, `RGBA`, `RRGGBB` or `RRGGBBAA` (where `R` `G` `B` `A` are hexadecimal digits).
+`ColorArray`:
+    Many RGBA colors, stored together in one contiguous block, so operations on all of them run vectorized (if NumPy is installed).
+`Palette`:
+    Many RGBA and HEXA colors with a spatial index, to quickly find the palette colors nearest to any color.
 
 -------------------------------------------------------------------------------------------------------------------------------------
 The `Color` class, which contains all sorts of different color-related methods:
@@ -22,25 +26,119 @@ The `Color` class, which contains all sorts of different color-related methods:
     - color to hexa
 - recognize colors inside strings and convert them to color types:
     - string to rgba
+    - iterate over all colors inside a (huge) text or file
 - convert an RGBA color to a HEX integer
 - convert a HEX integer to an RGBA color
 - get a colors luminance from the RGB channels
+- get the luminance and WCAG contrast ratio of many colors at once
 - get the optimal text color for on a colored background
 - adjust different color channels:
     - brightness
     - saturation
+- generate gradients between two or more colors
 """
 
 from .xx_regex import Regex
 
+from functools import lru_cache as _lru_cache, singledispatch as _singledispatch
+from typing import Iterable, Iterator, IO
+import array as _array
+import heapq as _heapq
+import mmap as _mmap
+import os as _os
 import re as _re
 
+try:
+    import numpy as _np
+except ImportError:
+    _np = None
+
+_set = object.__setattr__  # THE COLOR TYPES ARE IMMUTABLE, SO THEY CAN ONLY SET THEIR SLOTS THROUGH THIS
+
+CONVERSION_CACHE_SIZE = 1 << 14  # HOW MANY RGB ⇄ HSL CONVERSIONS ARE CACHED IN EACH DIRECTION
+WCAG_CONTRAST = {"AA": 4.5, "AAA": 7.0, "AA_large": 3.0, "AAA_large": 4.5}  # THE MINIMUM CONTRAST RATIOS OF WCAG 2
+HEXA_CACHE_SIZE = 1024  # HOW MANY `hexa()` COLORS ARE INTERNED BY DEFAULT (SEE `hexa.set_cache_size()`)
+PALETTE_LEAF_SIZE = 8  # UP TO HOW MANY COLORS A LEAF OF THE `Palette` K-D TREE HOLDS, BEFORE IT'S SPLIT
+COLOR_PATTERNS = {  # THE COLORS `Color.iter_colors()` FINDS IN A TEXT, EACH ONE A NAMED GROUP OF ONE COMBINED PATTERN
+    "rgba": r"(?P<rgba>\brgba?\(\s*(?P<r>\d{1,3})\s*,\s*(?P<g>\d{1,3})\s*,\s*(?P<b>\d{1,3})\s*(?:,\s*(?P<ra>\d*\.?\d+)\s*)?\))",
+    "hsla": r"(?P<hsla>\bhsla?\(\s*(?P<h>\d{1,3})\s*,\s*(?P<s>\d{1,3})%?\s*,\s*(?P<l>\d{1,3})%?\s*(?:,\s*(?P<ha>\d*\.?\d+)\s*)?\))",
+    "hexa": r"(?P<hexa>(?<![&\w])#(?P<hex>[0-9A-F]{8}|[0-9A-F]{6}|[0-9A-F]{3,4})(?![\w-]))",
+}
+
+
+def _srgb_to_linear(c: float) -> float:
+    return c / 12.92 if c < 0.03928 else ((c + 0.055) / 1.055) ** 2.4
+
+
+SRGB_TO_LINEAR = tuple(_srgb_to_linear(x / 255.0) for x in range(256))  # THE LINEAR LIGHT OF EACH 8-BIT sRGB CHANNEL VALUE
+
+
+@_lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def _rgb_to_hsl(r: int, g: int, b: int) -> tuple[int, int, int]:
+    r, g, b = r / 255.0, g / 255.0, b / 255.0
+    max_c, min_c = max(r, g, b), min(r, g, b)
+    l = (max_c + min_c) / 2
+    if max_c == min_c:
+        h = s = 0
+    else:
+        delta = max_c - min_c
+        s = delta / (1 - abs(2 * l - 1))
+        if max_c == r:
+            h = ((g - b) / delta) % 6
+        elif max_c == g:
+            h = ((b - r) / delta) + 2
+        else:
+            h = ((r - g) / delta) + 4
+        h /= 6
+    return int(round(h * 360)), int(round(s * 100)), int(round(l * 100))
+
+
+def _hue_to_rgb(p: float, q: float, t: float) -> float:
+    if t < 0:
+        t += 1
+    if t > 1:
+        t -= 1
+    if t < 1 / 6:
+        return p + (q - p) * 6 * t
+    if t < 1 / 2:
+        return q
+    if t < 2 / 3:
+        return p + (q - p) * (2 / 3 - t) * 6
+    return p
+
+
+def _rgb_to_lab(r: int, g: int, b: int) -> tuple[float, float, float]:
+    """Converts the sRGB channels to the CIELAB channels `L a b` (D65 white point)."""
+    r, g, b = SRGB_TO_LINEAR[r], SRGB_TO_LINEAR[g], SRGB_TO_LINEAR[b]
+    x, y, z = (
+        (0.4124564 * r + 0.3575761 * g + 0.1804375 * b) / 0.95047,
+        0.2126729 * r + 0.7151522 * g + 0.0721750 * b,
+        (0.0193339 * r + 0.1191920 * g + 0.9503041 * b) / 1.08883,
+    )
+    x, y, z = (t ** (1 / 3) if t > 216 / 24389 else (24389 / 27 * t + 16) / 116 for t in (x, y, z))
+    return 116 * y - 16, 500 * (x - y), 200 * (y - z)
+
+
+@_lru_cache(maxsize=CONVERSION_CACHE_SIZE)
+def _hsl_to_rgb(h: int, s: int, l: int) -> tuple[int, int, int]:
+    h, s, l = h / 360, s / 100, l / 100
+    if s == 0:
+        r = g = b = int(l * 255)
+    else:
+        q = l * (1 + s) if l < 0.5 else l + s - l * s
+        p = 2 * l - q
+        r = int(round(_hue_to_rgb(p, q, h + 1 / 3) * 255))
+        g = int(round(_hue_to_rgb(p, q, h) * 255))
+        b = int(round(_hue_to_rgb(p, q, h - 1 / 3) * 255))
+    return r, g, b
+
 
 class rgba:
     """An RGB/RGBA color: is a tuple of 3 integers, representing the red (`0`-`255`), green (`0`-`255`), and blue (`0`-`255`).\n
     Also includes an optional 4th param, which is a float, that represents the alpha channel (`0.0`-`1.0`).\n
     -----------------------------------------------------------------------------------------------------------------------------
     Includes methods:
+    - `rgba.from_int(hex_int)` to create the color from a HEX integer
     - `to_hsla()` to convert to HSL color
     - `to_hexa()` to convert to HEX color
     - `has_alpha()` to check if the color has an alpha channel
@@ -59,6 +157,8 @@ class rgba:
     - `with_alpha(alpha)` to create a new color with different alpha
     - `complementary()` to get the complementary color"""
 
+    __slots__ = ("r", "g", "b", "a")
+
     def __init__(self, r: int, g: int, b: int, a: float = None):
         if any(isinstance(x, rgba) for x in (r, g, b)):
             raise ValueError("Color is already a rgba() color")
@@ -69,8 +169,36 @@ class rgba:
             )
         elif a is not None and not (isinstance(a, (int, float)) and 0 <= a <= 1):
             raise ValueError(f"Alpha channel must be a float/int in [0.0, 1.0]: got '{a}'")
-        self.r, self.g, self.b = r, g, b
-        self.a = (1.0 if a > 1.0 else float(a)) if a else None
+        _set(self, "r", r)
+        _set(self, "g", g)
+        _set(self, "b", b)
+        _set(self, "a", (1.0 if a > 1.0 else float(a)) if a else None)
+
+    @classmethod
+    def _from_trusted(cls, r: int, g: int, b: int, a: float = None) -> "rgba":
+        """Creates the color without validating it, so the channels have to be valid already
+        and the alpha channel has to be either `None` or a float in `(0.0, 1.0]`."""
+        color = object.__new__(cls)
+        _set(color, "r", r)
+        _set(color, "g", g)
+        _set(color, "b", b)
+        _set(color, "a", a)
+        return color
+
+    @classmethod
+    def from_int(cls, hex_int: int, preserve_original: bool = False) -> "rgba":
+        """Creates the color from a HEX integer (see `Color.hex_int_to_rgba()`)."""
+        r, g, b, a = Color.hex_int_to_rgba(hex_int, preserve_original)
+        return cls._from_trusted(r, g, b, a or None)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"rgba() colors are immutable: can't set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"rgba() colors are immutable: can't delete '{name}'")
+
+    def __reduce__(self):
+        return (rgba, (self.r, self.g, self.b, self.a))
 
     def __len__(self):
         return 4 if self.a else 3
@@ -78,9 +206,6 @@ class rgba:
     def __iter__(self):
         return iter((self.r, self.g, self.b) + ((self.a,) if self.a else ()))
 
-    def __dict__(self):
-        return self.dict()
-
     def __getitem__(self, index):
         return ((self.r, self.g, self.b) + ((self.a,) if self.a else ()))[index]
 
@@ -93,12 +218,10 @@ class rgba:
     def __eq__(self, other):
         if not isinstance(other, rgba):
             return False
-        return (self.r, self.g, self.b, self.a) == (
-            other[0],
-            other[1],
-            other[2],
-            other[3],
-        )
+        return (self.r, self.g, self.b, self.a) == (other.r, other.g, other.b, other.a)
+
+    def __hash__(self):
+        return hash((self.r, self.g, self.b, self.a))
 
     def dict(self) -> dict:
         """Returns the color components as a dictionary with keys `'r'`, `'g'`, `'b'` and optionally `'a'`"""
@@ -110,11 +233,11 @@ class rgba:
 
     def to_hsla(self) -> "hsla":
         """Returns the color as a `hsla()` color"""
-        return hsla(*self._rgb_to_hsl(self.r, self.g, self.b), self.a)
+        return hsla._from_trusted(*_rgb_to_hsl(self.r, self.g, self.b), self.a)
 
     def to_hexa(self) -> "hexa":
         """Returns the color as a `hexa()` color"""
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return hexa._from_trusted(self.r, self.g, self.b, int(self.a * 255) / 255.0 if self.a else None)
 
     def has_alpha(self) -> bool:
         """Returns `True` if the color has an alpha channel and `False` otherwise"""
@@ -122,40 +245,32 @@ class rgba:
 
     def lighten(self, amount: float) -> "rgba":
         """Increases the colors lightness by the specified amount (`0.0`-`1.0`)"""
-        self.r, self.g, self.b, self.a = self.to_hsla().lighten(amount).to_rgba().values()
-        return rgba(self.r, self.g, self.b, self.a)
+        return self.to_hsla().lighten(amount).to_rgba()
 
     def darken(self, amount: float) -> "rgba":
         """Decreases the colors lightness by the specified amount (`0.0`-`1.0`)"""
-        self.r, self.g, self.b, self.a = self.to_hsla().darken(amount).to_rgba().values()
-        return rgba(self.r, self.g, self.b, self.a)
+        return self.to_hsla().darken(amount).to_rgba()
 
     def saturate(self, amount: float) -> "rgba":
         """Increases the colors saturation by the specified amount (`0.0`-`1.0`)"""
-        self.r, self.g, self.b, self.a = self.to_hsla().saturate(amount).to_rgba().values()
-        return rgba(self.r, self.g, self.b, self.a)
+        return self.to_hsla().saturate(amount).to_rgba()
 
     def desaturate(self, amount: float) -> "rgba":
         """Decreases the colors saturation by the specified amount (`0.0`-`1.0`)"""
-        self.r, self.g, self.b, self.a = self.to_hsla().desaturate(amount).to_rgba().values()
-        return rgba(self.r, self.g, self.b, self.a)
+        return self.to_hsla().desaturate(amount).to_rgba()
 
     def rotate(self, degrees: int) -> "rgba":
         """Rotates the colors hue by the specified number of degrees"""
-        self.r, self.g, self.b, self.a = self.to_hsla().rotate(degrees).to_rgba().values()
-        return rgba(self.r, self.g, self.b, self.a)
+        return self.to_hsla().rotate(degrees).to_rgba()
 
     def invert(self, invert_alpha: bool = False) -> "rgba":
         """Inverts the color by rotating hue by 180 degrees and inverting lightness"""
-        self.r, self.g, self.b = 255 - self.r, 255 - self.g, 255 - self.b
-        if invert_alpha:
-            self.a = 1 - self.a
-        return rgba(self.r, self.g, self.b, self.a)
+        return rgba._from_trusted(255 - self.r, 255 - self.g, 255 - self.b, ((1 - self.a) or None) if invert_alpha else self.a)
 
     def grayscale(self) -> "rgba":
         """Converts the color to grayscale using the luminance formula"""
-        self.r = self.g = self.b = Color.luminance(self.r, self.g, self.b)
-        return rgba(self.r, self.g, self.b, self.a)
+        l = Color.luminance(self.r, self.g, self.b)
+        return rgba._from_trusted(l, l, l, self.a)
 
     def blend(self, other: "rgba", ratio: float = 0.5, additive_alpha: bool = False) -> "rgba":
         """Blends the current color with another color using the specified ratio (`0.0`-`1.0`):
@@ -170,26 +285,18 @@ class rgba:
             else:
                 raise TypeError("'other' must be a valid RGBA color")
         ratio *= 2
-        self.r = max(0, min(255, int(round((self.r * (2 - ratio)) + (other.r * ratio)))))
-        self.g = max(0, min(255, int(round((self.g * (2 - ratio)) + (other.g * ratio)))))
-        self.b = max(0, min(255, int(round((self.b * (2 - ratio)) + (other.b * ratio)))))
-        none_alpha = self.a is None and (len(other) <= 3 or other[3] is None)
-        if not none_alpha:
-            self_a = self.a if self.a is not None else 1
-            other_a = (other[3] if other[3] is not None else 1) if len(other) > 3 else 1
-            if additive_alpha:
-                self.a = max(0, min(1, (self_a * (2 - ratio)) + (other_a * ratio)))
-            else:
-                self.a = max(
-                    0,
-                    min(
-                        1,
-                        (self_a * (1 - (ratio / 2))) + (other_a * (ratio / 2)),
-                    ),
-                )
+        r = max(0, min(255, int(round((self.r * (2 - ratio)) + (other.r * ratio)))))
+        g = max(0, min(255, int(round((self.g * (2 - ratio)) + (other.g * ratio)))))
+        b = max(0, min(255, int(round((self.b * (2 - ratio)) + (other.b * ratio)))))
+        if self.a is None and other.a is None:
+            return rgba._from_trusted(r, g, b)
+        self_a = self.a if self.a is not None else 1
+        other_a = other.a if other.a is not None else 1
+        if additive_alpha:
+            a = max(0, min(1, (self_a * (2 - ratio)) + (other_a * ratio)))
         else:
-            self.a = None
-        return rgba(self.r, self.g, self.b, None if none_alpha else self.a)
+            a = max(0, min(1, (self_a * (1 - (ratio / 2))) + (other_a * (ratio / 2))))
+        return rgba._from_trusted(r, g, b, float(a) or None)
 
     def is_dark(self) -> bool:
         """Returns `True` if the color is considered dark (`lightness < 50%`)"""
@@ -211,30 +318,12 @@ class rgba:
         """Returns a new color with the specified alpha value"""
         if not (isinstance(alpha, (int, float)) and 0 <= alpha <= 1):
             raise ValueError("'alpha' must be a float/int in [0.0, 1.0]")
-        return rgba(self.r, self.g, self.b, alpha)
+        return rgba._from_trusted(self.r, self.g, self.b, float(alpha) or None)
 
     def complementary(self) -> "rgba":
         """Returns the complementary color (180 degrees on the color wheel)"""
         return self.to_hsla().complementary().to_rgba()
 
-    def _rgb_to_hsl(self, r: int, g: int, b: int) -> tuple:
-        r, g, b = r / 255.0, g / 255.0, b / 255.0
-        max_c, min_c = max(r, g, b), min(r, g, b)
-        l = (max_c + min_c) / 2
-        if max_c == min_c:
-            h = s = 0
-        else:
-            delta = max_c - min_c
-            s = delta / (1 - abs(2 * l - 1))
-            if max_c == r:
-                h = ((g - b) / delta) % 6
-            elif max_c == g:
-                h = ((b - r) / delta) + 2
-            else:
-                h = ((r - g) / delta) + 4
-            h /= 6
-        return int(round(h * 360)), int(round(s * 100)), int(round(l * 100))
-
 
 class hsla:
     """A HSL/HSLA color: is a tuple of 3 integers, representing hue (`0`-`360`), saturation (`0`-`100`), and lightness (`0`-`100`).\n
@@ -259,6 +348,8 @@ class hsla:
     - `with_alpha(alpha)` to create a new color with different alpha
     - `complementary()` to get the complementary color"""
 
+    __slots__ = ("h", "s", "l", "a")
+
     def __init__(self, h: int, s: int, l: int, a: float = None):
         if any(isinstance(x, hsla) for x in (h, s, l)):
             raise ValueError("Color is already a hsla() color")
@@ -269,8 +360,30 @@ class hsla:
             )
         elif a is not None and (not isinstance(a, (int, float)) or not 0 <= a <= 1):
             raise ValueError(f"Alpha channel must be a float/int in [0.0, 1.0]: got '{a}'")
-        self.h, self.s, self.l = h, s, l
-        self.a = (1.0 if a > 1.0 else float(a)) if a else None
+        _set(self, "h", h)
+        _set(self, "s", s)
+        _set(self, "l", l)
+        _set(self, "a", (1.0 if a > 1.0 else float(a)) if a else None)
+
+    @classmethod
+    def _from_trusted(cls, h: int, s: int, l: int, a: float = None) -> "hsla":
+        """Creates the color without validating it, so the channels have to be valid already
+        and the alpha channel has to be either `None` or a float in `(0.0, 1.0]`."""
+        color = object.__new__(cls)
+        _set(color, "h", h)
+        _set(color, "s", s)
+        _set(color, "l", l)
+        _set(color, "a", a)
+        return color
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"hsla() colors are immutable: can't set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"hsla() colors are immutable: can't delete '{name}'")
+
+    def __reduce__(self):
+        return (hsla, (self.h, self.s, self.l, self.a))
 
     def __len__(self):
         return 4 if self.a else 3
@@ -278,9 +391,6 @@ class hsla:
     def __iter__(self):
         return iter((self.h, self.s, self.l) + ((self.a,) if self.a else ()))
 
-    def __dict__(self):
-        return self.dict()
-
     def __getitem__(self, index):
         return ((self.h, self.s, self.l) + ((self.a,) if self.a else ()))[index]
 
@@ -293,12 +403,10 @@ class hsla:
     def __eq__(self, other):
         if not isinstance(other, hsla):
             return False
-        return (self.h, self.s, self.l, self.a) == (
-            other[0],
-            other[1],
-            other[2],
-            other[3],
-        )
+        return (self.h, self.s, self.l, self.a) == (other.h, other.s, other.l, other.a)
+
+    def __hash__(self):
+        return hash((self.h, self.s, self.l, self.a))
 
     def dict(self) -> dict:
         """Returns the color components as a dictionary with keys `'h'`, `'s'`, `'l'` and optionally `'a'`"""
@@ -310,12 +418,11 @@ class hsla:
 
     def to_rgba(self) -> "rgba":
         """Returns the color as a `rgba()` color"""
-        return rgba(*self._hsl_to_rgb(self.h, self.s, self.l), self.a)
+        return rgba._from_trusted(*_hsl_to_rgb(self.h, self.s, self.l), self.a)
 
     def to_hexa(self) -> "hexa":
         """Returns the color as a `hexa()` color"""
-        r, g, b = self._hsl_to_rgb(self.h, self.s, self.l)
-        return hexa(f'#{r:02X}{g:02X}{b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return hexa._from_trusted(*_hsl_to_rgb(self.h, self.s, self.l), int(self.a * 255) / 255.0 if self.a else None)
 
     def has_alpha(self) -> bool:
         """Returns `True` if the color has an alpha channel and `False` otherwise"""
@@ -325,56 +432,48 @@ class hsla:
         """Increases the colors lightness by the specified amount (`0.0`-`1.0`)"""
         if not (isinstance(amount, (int, float)) and 0 <= amount <= 1):
             raise ValueError("'amount' must be a float/int in [0.0, 1.0]")
-        self.l = int(min(100, self.l + (100 - self.l) * amount))
-        return hsla(self.h, self.s, self.l, self.a)
+        return hsla._from_trusted(self.h, self.s, int(min(100, self.l + (100 - self.l) * amount)), self.a)
 
     def darken(self, amount: float) -> "hsla":
         """Decreases the colors lightness by the specified amount (`0.0`-`1.0`)"""
         if not (isinstance(amount, (int, float)) and 0 <= amount <= 1):
             raise ValueError("'amount' must be a float/int in [0.0, 1.0]")
-        self.l = int(max(0, self.l * (1 - amount)))
-        return hsla(self.h, self.s, self.l, self.a)
+        return hsla._from_trusted(self.h, self.s, int(max(0, self.l * (1 - amount))), self.a)
 
     def saturate(self, amount: float) -> "hsla":
         """Increases the colors saturation by the specified amount (`0.0`-`1.0`)"""
         if not (isinstance(amount, (int, float)) and 0 <= amount <= 1):
             raise ValueError("'amount' must be a float/int in [0.0, 1.0]")
-        self.s = int(min(100, self.s + (100 - self.s) * amount))
-        return hsla(self.h, self.s, self.l, self.a)
+        return hsla._from_trusted(self.h, int(min(100, self.s + (100 - self.s) * amount)), self.l, self.a)
 
     def desaturate(self, amount: float) -> "hsla":
         """Decreases the colors saturation by the specified amount (`0.0`-`1.0`)"""
         if not (isinstance(amount, (int, float)) and 0 <= amount <= 1):
             raise ValueError("'amount' must be a float/int in [0.0, 1.0]")
-        self.s = int(max(0, self.s * (1 - amount)))
-        return hsla(self.h, self.s, self.l, self.a)
+        return hsla._from_trusted(self.h, int(max(0, self.s * (1 - amount))), self.l, self.a)
 
     def rotate(self, degrees: int) -> "hsla":
         """Rotates the colors hue by the specified number of degrees"""
-        self.h = (self.h + degrees) % 360
-        return hsla(self.h, self.s, self.l, self.a)
+        return hsla((self.h + degrees) % 360, self.s, self.l, self.a)
 
     def invert(self, invert_alpha: bool = False) -> "hsla":
         """Inverts the color by rotating hue by 180 degrees and inverting lightness"""
-        self.h = (self.h + 180) % 360
-        self.l = 100 - self.l
-        if invert_alpha:
-            self.a = 1 - self.a
-        return hsla(self.h, self.s, self.l, self.a)
+        return hsla._from_trusted(
+            (self.h + 180) % 360, self.s, 100 - self.l, ((1 - self.a) or None) if invert_alpha else self.a
+        )
 
     def grayscale(self) -> "hsla":
         """Converts the color to grayscale using the luminance formula"""
-        l = Color.luminance(*self._hsl_to_rgb(self.h, self.s, self.l))
-        self.h, self.s, self.l, _ = rgba(l, l, l).to_hsla().values()
-        return hsla(self.h, self.s, self.l, self.a)
+        l = Color.luminance(*_hsl_to_rgb(self.h, self.s, self.l))
+        h, s, l, _ = rgba._from_trusted(l, l, l).to_hsla().values()
+        return hsla._from_trusted(h, s, l, self.a)
 
     def blend(self, other: "hsla", ratio: float = 0.5, additive_alpha: bool = False) -> "rgba":
         """Blends the current color with another color using the specified ratio (`0.0`-`1.0`):
         - if `ratio` is `0.0` it means 100% of the current color and 0% of the `other` color (2:0 mixture)
         - if `ratio` is `0.5` it means 50% of both colors (1:1 mixture)
         - if `ratio` is `1.0` it means 0% of the current color and 100% of the `other` color (0:2 mixture)"""
-        self.h, self.s, self.l, self.a = self.to_rgba().blend(Color.to_rgba(other), ratio, additive_alpha).to_hsla().values()
-        return hsla(self.h, self.s, self.l, self.a)
+        return self.to_rgba().blend(Color.to_rgba(other), ratio, additive_alpha).to_hsla()
 
     def is_dark(self) -> bool:
         """Returns `True` if the color is considered dark (`lightness < 50%`)"""
@@ -396,44 +495,22 @@ class hsla:
         """Returns a new color with the specified alpha value"""
         if not (isinstance(alpha, (int, float)) and 0 <= alpha <= 1):
             raise ValueError("'alpha' must be a float/int in [0.0, 1.0]")
-        return hsla(self.h, self.s, self.l, alpha)
+        return hsla._from_trusted(self.h, self.s, self.l, float(alpha) or None)
 
     def complementary(self) -> "hsla":
         """Returns the complementary color (180 degrees on the color wheel)"""
-        return hsla((self.h + 180) % 360, self.s, self.l, self.a)
-
-    def _hsl_to_rgb(self, h: int, s: int, l: int) -> tuple:
-        h, s, l = h / 360, s / 100, l / 100
-        if s == 0:
-            r = g = b = int(l * 255)
-        else:
-
-            def hue_to_rgb(p, q, t):
-                if t < 0:
-                    t += 1
-                if t > 1:
-                    t -= 1
-                if t < 1 / 6:
-                    return p + (q - p) * 6 * t
-                if t < 1 / 2:
-                    return q
-                if t < 2 / 3:
-                    return p + (q - p) * (2 / 3 - t) * 6
-                return p
-
-            q = l * (1 + s) if l < 0.5 else l + s - l * s
-            p = 2 * l - q
-            r = int(round(hue_to_rgb(p, q, h + 1 / 3) * 255))
-            g = int(round(hue_to_rgb(p, q, h) * 255))
-            b = int(round(hue_to_rgb(p, q, h - 1 / 3) * 255))
-        return r, g, b
+        return hsla._from_trusted((self.h + 180) % 360, self.s, self.l, self.a)
 
 
 class hexa:
     """A HEX color: is a string representing a hexadecimal color code with optional alpha channel.\n
     -------------------------------------------------------------------------------------------------
     Supports formats: RGB, RGBA, RRGGBB, RRGGBBAA (with or without prefix)
+    The same HEX string or integer gives the same immutable color object (interned in an LRU cache).
     Includes methods:
+    - `hexa.from_int(hex_int)` to create the color from a HEX integer
+    - `hexa.cache_info()` to get the statistics of the interning cache
+    - `hexa.set_cache_size(maxsize)` to set how many colors the interning cache keeps
     - `to_rgba()` to convert to RGB color
     - `to_hsla()` to convert to HSL color
     - `has_alpha()` to check if the color has an alpha channel
@@ -452,48 +529,64 @@ class hexa:
     - `with_alpha(alpha)` to create a new color with different alpha
     - `complementary()` to get the complementary color"""
 
-    def __init__(self, color: str | int):
+    __slots__ = ("r", "g", "b", "a")
+
+    def __new__(cls, color: str | int):
         if isinstance(color, hexa):
             raise ValueError("Color is already a hexa() color")
-        if isinstance(color, str):
-            if color.startswith("#"):
-                color = color[1:].upper()
-            elif color.startswith("0x"):
-                color = color[2:].upper()
-            if len(color) == 3:  # RGB
-                self.r, self.g, self.b, self.a = (
-                    int(color[0] * 2, 16),
-                    int(color[1] * 2, 16),
-                    int(color[2] * 2, 16),
-                    None,
-                )
-            elif len(color) == 4:  # RGBA
-                self.r, self.g, self.b, self.a = (
-                    int(color[0] * 2, 16),
-                    int(color[1] * 2, 16),
-                    int(color[2] * 2, 16),
-                    int(color[3] * 2, 16) / 255.0,
-                )
-            elif len(color) == 6:  # RRGGBB
-                self.r, self.g, self.b, self.a = (
-                    int(color[0:2], 16),
-                    int(color[2:4], 16),
-                    int(color[4:6], 16),
-                    None,
-                )
-            elif len(color) == 8:  # RRGGBBAA
-                self.r, self.g, self.b, self.a = (
-                    int(color[0:2], 16),
-                    int(color[2:4], 16),
-                    int(color[4:6], 16),
-                    int(color[6:8], 16) / 255.0,
-                )
-            else:
-                raise ValueError(f"Invalid HEX format '{color}'")
-        elif isinstance(color, int):
-            self.r, self.g, self.b, self.a = Color.hex_int_to_rgba(color)
-        else:
+        elif isinstance(color, str):
+            color = (color[1:] if color.startswith("#") else color[2:] if color.startswith("0x") else color).upper()
+        elif not isinstance(color, int):
             raise TypeError(f"HEX color must be of type 'str' or 'int': got '{type(color)}'")
+        return _interned_hexa(cls, color)
+
+    @classmethod
+    def _from_trusted(cls, r: int, g: int, b: int, a: float = None) -> "hexa":
+        """Creates the color without validating it, so the channels have to be valid already
+        and the alpha channel has to be either `None` or a float in `[0.0, 1.0]`, which is a multiple of `1 / 255`."""
+        color = object.__new__(cls)
+        _set(color, "r", r)
+        _set(color, "g", g)
+        _set(color, "b", b)
+        _set(color, "a", a)
+        return color
+
+    @classmethod
+    def from_int(cls, hex_int: int, preserve_original: bool = False) -> "hexa":
+        """Creates the color from a HEX integer (see `Color.hex_int_to_rgba()`)."""
+        if preserve_original:
+            return cls._from_trusted(*Color.hex_int_to_rgba(hex_int, preserve_original))
+        return _interned_hexa(cls, hex_int)
+
+    @staticmethod
+    def cache_info() -> tuple[int, int, int, int]:
+        """Get the statistics `(hits, misses, maxsize, currsize)` of the interning cache, through which the same
+        HEX string or integer gives the same (immutable) `hexa()` color object, instead of parsing it again.\n
+        -------------------------------------------------------------------------------------------------------
+        The hit rate of the cache is `hits / (hits + misses)`."""
+        return _interned_hexa.cache_info()
+
+    @staticmethod
+    def set_cache_size(maxsize: int) -> None:
+        """Set how many of the most recently used `hexa()` colors are kept in the interning cache
+        (`0` turns the interning off). This also clears the cache and its statistics."""
+        global _interned_hexa
+        if not (isinstance(maxsize, int) and maxsize >= 0):
+            raise ValueError("'maxsize' must be an integer >= 0")
+        _interned_hexa = _lru_cache(maxsize=maxsize)(_parse_hexa)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"hexa() colors are immutable: can't set '{name}'")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"hexa() colors are immutable: can't delete '{name}'")
+
+    def __reduce__(self):
+        return (object.__new__, (hexa,), self.values())
+
+    def __setstate__(self, state):
+        for name, value in zip(hexa.__slots__, state):
+            _set(self, name, value)
 
     def __len__(self):
         return 4 if self.a else 3
@@ -501,9 +594,6 @@ class hexa:
     def __iter__(self):
         return iter((f"{self.r:02X}", f"{self.g:02X}", f"{self.b:02X}") + ((f"{int(self.a * 255):02X}",) if self.a else ()))
 
-    def __dict__(self):
-        return self.dict()
-
     def __getitem__(self, index):
         return ((f"{self.r:02X}", f"{self.g:02X}", f"{self.b:02X}") + ((f"{int(self.a * 255):02X}",) if self.a else ()))[index]
 
@@ -516,12 +606,10 @@ class hexa:
     def __eq__(self, other):
         if not isinstance(other, hexa):
             return False
-        return (self.r, self.g, self.b, self.a) == (
-            other[0],
-            other[1],
-            other[2],
-            other[3],
-        )
+        return (self.r, self.g, self.b, self.a) == (other.r, other.g, other.b, other.a)
+
+    def __hash__(self):
+        return hash((self.r, self.g, self.b, self.a))
 
     def dict(self) -> dict:
         """Returns the color components as a dictionary with hex string values for keys `'r'`, `'g'`, `'b'` and optionally `'a'`"""
@@ -542,11 +630,11 @@ class hexa:
 
     def to_rgba(self, round_alpha: bool = True) -> "rgba":
         """Returns the color as a `rgba()` color"""
-        return rgba(
+        return rgba._from_trusted(
             self.r,
             self.g,
             self.b,
-            (round(self.a, 2) if round_alpha else self.a) if self.a else None,
+            ((round(self.a, 2) if round_alpha else self.a) or None) if self.a else None,
         )
 
     def to_hsla(self, round_alpha: bool = True) -> "hsla":
@@ -559,48 +647,39 @@ class hexa:
 
     def lighten(self, amount: float) -> "hexa":
         """Increases the colors lightness by the specified amount (`0.0`-`1.0`)"""
-        self.r, self.g, self.b, self.a = self.to_rgba(False).lighten(amount).values()
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return self.to_rgba(False).lighten(amount).to_hexa()
 
     def darken(self, amount: float) -> "hexa":
         """Decreases the colors lightness by the specified amount (`0.0`-`1.0`)"""
-        self.r, self.g, self.b, self.a = self.to_rgba(False).darken(amount).values()
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return self.to_rgba(False).darken(amount).to_hexa()
 
     def saturate(self, amount: float) -> "hexa":
         """Increases the colors saturation by the specified amount (`0.0`-`1.0`)"""
-        self.r, self.g, self.b, self.a = self.to_rgba(False).saturate(amount).values()
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return self.to_rgba(False).saturate(amount).to_hexa()
 
     def desaturate(self, amount: float) -> "hexa":
         """Decreases the colors saturation by the specified amount (`0.0`-`1.0`)"""
-        self.r, self.g, self.b, self.a = self.to_rgba(False).desaturate(amount).values()
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return self.to_rgba(False).desaturate(amount).to_hexa()
 
     def rotate(self, degrees: int) -> "hexa":
         """Rotates the colors hue by the specified number of degrees"""
-        self.r, self.g, self.b, self.a = self.to_rgba(False).rotate(degrees).values()
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return self.to_rgba(False).rotate(degrees).to_hexa()
 
     def invert(self, invert_alpha: bool = False) -> "hexa":
         """Inverts the color by rotating hue by 180 degrees and inverting lightness"""
-        self.r, self.g, self.b, self.a = self.to_rgba(False).invert().values()
-        if invert_alpha:
-            self.a = 1 - self.a
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return self.to_rgba(False).invert(invert_alpha).to_hexa()
 
     def grayscale(self) -> "hexa":
         """Converts the color to grayscale using the luminance formula"""
-        self.r = self.g = self.b = Color.luminance(self.r, self.g, self.b)
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        l = Color.luminance(self.r, self.g, self.b)
+        return hexa._from_trusted(l, l, l, self.a or None)
 
     def blend(self, other: "hexa", ratio: float = 0.5, additive_alpha: bool = False) -> "rgba":
         """Blends the current color with another color using the specified ratio (`0.0`-`1.0`):
         - if `ratio` is `0.0` it means 100% of the current color and 0% of the `other` color (2:0 mixture)
         - if `ratio` is `0.5` it means 50% of both colors (1:1 mixture)
         - if `ratio` is `1.0` it means 0% of the current color and 100% of the `other` color (0:2 mixture)"""
-        self.r, self.g, self.b, self.a = self.to_rgba(False).blend(Color.to_rgba(other), ratio, additive_alpha).values()
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(self.a * 255):02X}" if self.a else ""}')
+        return self.to_rgba(False).blend(Color.to_rgba(other), ratio, additive_alpha).to_hexa()
 
     def is_dark(self) -> bool:
         """Returns `True` if the color is considered dark (`lightness < 50%`)"""
@@ -622,13 +701,653 @@ class hexa:
         """Returns a new color with the specified alpha value"""
         if not (isinstance(alpha, (int, float)) and 0 <= alpha <= 1):
             raise ValueError("'alpha' must be in [0.0, 1.0]")
-        return hexa(f'#{self.r:02X}{self.g:02X}{self.b:02X}{f"{int(alpha * 255):02X}" if alpha else ""}')
+        return hexa._from_trusted(self.r, self.g, self.b, int(alpha * 255) / 255.0 if alpha else None)
 
     def complementary(self) -> "hexa":
         """Returns the complementary color (180 degrees on the color wheel)"""
         return self.to_hsla(False).complementary().to_hexa()
 
 
+def _parse_hexa(cls: type, color: str | int) -> hexa:
+    """Parses a HEX string (already without prefix and in uppercase) or a HEX integer into a new `hexa()` color."""
+    if isinstance(color, int):
+        return cls._from_trusted(*Color.hex_int_to_rgba(color))
+    elif len(color) == 3:  # RGB
+        return cls._from_trusted(int(color[0] * 2, 16), int(color[1] * 2, 16), int(color[2] * 2, 16), None)
+    elif len(color) == 4:  # RGBA
+        return cls._from_trusted(
+            int(color[0] * 2, 16), int(color[1] * 2, 16), int(color[2] * 2, 16), int(color[3] * 2, 16) / 255.0
+        )
+    elif len(color) == 6:  # RRGGBB
+        return cls._from_trusted(int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16), None)
+    elif len(color) == 8:  # RRGGBBAA
+        return cls._from_trusted(int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16), int(color[6:8], 16) / 255.0)
+    raise ValueError(f"Invalid HEX format '{color}'")
+
+
+_interned_hexa = _lru_cache(maxsize=HEXA_CACHE_SIZE)(_parse_hexa)  # THE SAME HEX STRING OR INTEGER GIVES THE SAME COLOR
+
+
+class ColorArray:
+    """Many RGBA colors, stored together as one contiguous block of N×4 float channels `r, g, b, a`
+    (colors without an alpha channel have their alpha stored as `NaN`).\n
+    -------------------------------------------------------------------------------------------------------------------------
+    If NumPy is installed, the channels are stored in a NumPy array and all methods run vectorized over all colors at once.
+    Otherwise they're stored in an `array('d')` and the methods fall back to calling the `rgba()` methods color by color.
+    Either way, the results are exactly the same as calling the `rgba()` methods on each color on its own.\n
+    -------------------------------------------------------------------------------------------------------------------------
+    Includes methods:
+    - `to_rgba()` to convert to a list of RGB colors
+    - `to_hsla()` to convert to a list of HSL colors
+    - `to_hexa()` to convert to a list of HEX colors
+    - `lighten(amount)` to create lighter versions of the colors
+    - `darken(amount)` to create darker versions of the colors
+    - `saturate(amount)` to increase the colors saturation
+    - `desaturate(amount)` to decrease the colors saturation
+    - `rotate(degrees)` to rotate the colors hue by degrees
+    - `invert()` to get the inverse colors
+    - `grayscale()` to convert the colors to grayscale
+    - `blend(other, ratio)` to blend with another color or a `ColorArray` of the same length
+    - `luminance()` to get the luminance of each color
+    - `is_dark()` to check which colors are considered dark\n
+    -------------------------------------------------------------------------------------------------------------------------
+    The `colors` can be any colors, which `Color.to_rgba()` is able to convert."""
+
+    __slots__ = ("_data",)
+
+    def __init__(self, colors: Iterable[rgba | hsla | hexa | str | int | tuple | list | dict]):
+        channels = []
+        for color in colors:
+            color = color if isinstance(color, rgba) else Color.to_rgba(color)
+            channels.extend((color.r, color.g, color.b, float("nan") if color.a is None else color.a))
+        self._data = _array.array("d", channels) if _np is None else _np.array(channels, dtype=float).reshape(-1, 4)
+
+    @classmethod
+    def _from_data(cls, data) -> "ColorArray":
+        """Creates the array directly from already valid channels (a N×4 NumPy array or a flat `array('d')`)."""
+        colors = object.__new__(cls)
+        colors._data = data
+        return colors
+
+    def _rows(self) -> Iterable[tuple[float, float, float, float]]:
+        return zip(*[iter(self._data)] * 4) if isinstance(self._data, _array.array) else self._data.tolist()
+
+    def __len__(self):
+        return len(self._data) // 4 if isinstance(self._data, _array.array) else len(self._data)
+
+    def __iter__(self):
+        return (rgba._from_trusted(int(r), int(g), int(b), None if a != a else a) for r, g, b, a in self._rows())
+
+    def __getitem__(self, index: int | slice) -> "rgba | ColorArray":
+        if isinstance(self._data, _array.array):
+            if isinstance(index, slice):
+                return ColorArray._from_data(
+                    _array.array("d", [x for i in range(len(self))[index] for x in self._data[i * 4 : i * 4 + 4]])
+                )
+            r, g, b, a = self._data[(index := range(len(self))[index]) * 4 : index * 4 + 4]
+        elif isinstance(index, slice):
+            return ColorArray._from_data(self._data[index])
+        else:
+            r, g, b, a = self._data[index].tolist()
+        return rgba._from_trusted(int(r), int(g), int(b), None if a != a else a)
+
+    def __repr__(self):
+        return f"ColorArray([{', '.join(repr(color) for color in self)}])"
+
+    def to_rgba(self) -> list[rgba]:
+        """Returns the colors as a list of `rgba()` colors"""
+        return list(self)
+
+    def to_hsla(self) -> list[hsla]:
+        """Returns the colors as a list of `hsla()` colors"""
+        if isinstance(self._data, _array.array):
+            return [color.to_hsla() for color in self]
+        alpha = self._data[:, 3].tolist()
+        return [
+            hsla._from_trusted(int(h), int(s), int(l), None if a != a else a)
+            for (h, s, l), a in zip(_np.stack(self._hsl(), axis=1).tolist(), alpha)
+        ]
+
+    def to_hexa(self) -> list[hexa]:
+        """Returns the colors as a list of `hexa()` colors"""
+        if isinstance(self._data, _array.array):
+            return [color.to_hexa() for color in self]
+        alpha = _np.trunc(self._data[:, 3] * 255) / 255.0
+        return [
+            hexa._from_trusted(int(r), int(g), int(b), None if a != a else a)
+            for (r, g, b), a in zip(self._data[:, :3].tolist(), alpha.tolist())
+        ]
+
+    def lighten(self, amount: float) -> "ColorArray":
+        """Increases the colors lightness by the specified amount (`0.0`-`1.0`)"""
+        if isinstance(self._data, _array.array):
+            return ColorArray(color.lighten(amount) for color in self)
+        ColorArray._check_amount(amount)
+        h, s, l = self._hsl()
+        return self._with_hsl(h, s, _np.trunc(_np.minimum(100, l + (100 - l) * amount)))
+
+    def darken(self, amount: float) -> "ColorArray":
+        """Decreases the colors lightness by the specified amount (`0.0`-`1.0`)"""
+        if isinstance(self._data, _array.array):
+            return ColorArray(color.darken(amount) for color in self)
+        ColorArray._check_amount(amount)
+        h, s, l = self._hsl()
+        return self._with_hsl(h, s, _np.trunc(_np.maximum(0, l * (1 - amount))))
+
+    def saturate(self, amount: float) -> "ColorArray":
+        """Increases the colors saturation by the specified amount (`0.0`-`1.0`)"""
+        if isinstance(self._data, _array.array):
+            return ColorArray(color.saturate(amount) for color in self)
+        ColorArray._check_amount(amount)
+        h, s, l = self._hsl()
+        return self._with_hsl(h, _np.trunc(_np.minimum(100, s + (100 - s) * amount)), l)
+
+    def desaturate(self, amount: float) -> "ColorArray":
+        """Decreases the colors saturation by the specified amount (`0.0`-`1.0`)"""
+        if isinstance(self._data, _array.array):
+            return ColorArray(color.desaturate(amount) for color in self)
+        ColorArray._check_amount(amount)
+        h, s, l = self._hsl()
+        return self._with_hsl(h, _np.trunc(_np.maximum(0, s * (1 - amount))), l)
+
+    def rotate(self, degrees: int) -> "ColorArray":
+        """Rotates the colors hue by the specified number of degrees"""
+        if isinstance(self._data, _array.array):
+            return ColorArray(color.rotate(degrees) for color in self)
+        if not isinstance(degrees, int):
+            raise ValueError(f"'degrees' must be an integer: got '{degrees}'")
+        h, s, l = self._hsl()
+        return self._with_hsl((h + degrees) % 360, s, l)
+
+    def invert(self, invert_alpha: bool = False) -> "ColorArray":
+        """Inverts the colors by inverting each of the R G B channels
+        (with `invert_alpha`, colors without an alpha channel still won't get one)"""
+        if isinstance(self._data, _array.array):
+            return ColorArray(color.invert(invert_alpha and color.a is not None) for color in self)
+        data = self._data.copy()
+        data[:, :3] = 255 - data[:, :3]
+        if invert_alpha:
+            data[:, 3] = 1 - data[:, 3]
+            data[data[:, 3] == 0, 3] = _np.nan
+        return ColorArray._from_data(data)
+
+    def grayscale(self) -> "ColorArray":
+        """Converts the colors to grayscale using the luminance formula"""
+        if isinstance(self._data, _array.array):
+            return ColorArray(color.grayscale() for color in self)
+        data = self._data.copy()
+        data[:, :3] = self.luminance()[:, None]
+        return ColorArray._from_data(data)
+
+    def blend(
+        self,
+        other: "rgba | ColorArray",
+        ratio: float = 0.5,
+        additive_alpha: bool = False,
+    ) -> "ColorArray":
+        """Blends the colors with another color or with the colors of another `ColorArray` of the same length,
+        using the specified ratio (`0.0`-`1.0`), exactly like `rgba.blend()` does it."""
+        if not (isinstance(ratio, (int, float)) and 0 <= ratio <= 1):
+            raise ValueError("'ratio' must be a float/int in [0.0, 1.0]")
+        elif not isinstance(other, ColorArray):
+            if not isinstance(other, rgba):
+                if not Color.is_valid_rgba(other):
+                    raise TypeError("'other' must be a valid RGBA color or a ColorArray")
+                other = rgba(*other)
+            other = ColorArray([other])
+        elif len(other) != len(self):
+            raise ValueError(f"Can't blend {len(self)} colors with {len(other)} other colors")
+        if isinstance(self._data, _array.array) or isinstance(other._data, _array.array):
+            others = list(other) * len(self) if len(other) == 1 else other
+            return ColorArray(color.blend(o, ratio, additive_alpha) for color, o in zip(self, others))
+        ratio *= 2
+        data = _np.empty(_np.broadcast_shapes(self._data.shape, other._data.shape))
+        data[:, :3] = _np.clip(_np.round((self._data[:, :3] * (2 - ratio)) + (other._data[:, :3] * ratio)), 0, 255)
+        self_a, other_a = _np.nan_to_num(self._data[:, 3], nan=1), _np.nan_to_num(other._data[:, 3], nan=1)
+        if additive_alpha:
+            data[:, 3] = _np.clip((self_a * (2 - ratio)) + (other_a * ratio), 0, 1)
+        else:
+            data[:, 3] = _np.clip((self_a * (1 - (ratio / 2))) + (other_a * (ratio / 2)), 0, 1)
+        data[(data[:, 3] == 0) | (_np.isnan(self._data[:, 3]) & _np.isnan(other._data[:, 3])), 3] = _np.nan
+        return ColorArray._from_data(data)
+
+    def luminance(self):
+        """Returns the luminance of each color as an integer in [0, 255], like `Color.luminance()` calculates it
+        (as a NumPy array if NumPy is installed, otherwise as a list)."""
+        if isinstance(self._data, _array.array):
+            return [round(l * 255) for l in Color.luminance_many(self)]
+        return _np.round(Color.luminance_many(self) * 255).astype(int)
+
+    def is_dark(self):
+        """Returns for each color, if it's considered dark (`lightness < 50%`)
+        (as a NumPy array if NumPy is installed, otherwise as a list)."""
+        if isinstance(self._data, _array.array):
+            return [color.is_dark() for color in self]
+        return (0.299 * self._data[:, 0] + 0.587 * self._data[:, 1] + 0.114 * self._data[:, 2]) < 128
+
+    @staticmethod
+    def _check_amount(amount: float) -> None:
+        if not (isinstance(amount, (int, float)) and 0 <= amount <= 1):
+            raise ValueError("'amount' must be a float/int in [0.0, 1.0]")
+
+    def _hsl(self) -> tuple:
+        """Returns the H S L channels of all colors, calculated exactly like `_rgb_to_hsl()` does it."""
+        r, g, b = (self._data[:, :3] / 255.0).T
+        max_c, min_c = _np.maximum(_np.maximum(r, g), b), _np.minimum(_np.minimum(r, g), b)
+        l = (max_c + min_c) / 2
+        delta = max_c - min_c
+        gray = max_c == min_c
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            s = _np.where(gray, 0, delta / (1 - _np.abs(2 * l - 1)))
+            h = _np.where(
+                max_c == r,
+                ((g - b) / delta) % 6,
+                _np.where(max_c == g, ((b - r) / delta) + 2, ((r - g) / delta) + 4),
+            )
+        h = _np.where(gray, 0, h / 6)
+        return _np.round(h * 360), _np.round(s * 100), _np.round(l * 100)
+
+    def _with_hsl(self, h, s, l) -> "ColorArray":
+        """Returns a new array with the colors converted back from the H S L channels, exactly like `_hsl_to_rgb()`
+        does it, and the alpha channels of this array."""
+        h, s, l = h / 360, s / 100, l / 100
+        q = _np.where(l < 0.5, l * (1 + s), l + s - l * s)
+        p = 2 * l - q
+
+        def hue_to_rgb(t):
+            t = _np.where(t < 0, t + 1, t)
+            t = _np.where(t > 1, t - 1, t)
+            return _np.where(
+                t < 1 / 6,
+                p + (q - p) * 6 * t,
+                _np.where(t < 1 / 2, q, _np.where(t < 2 / 3, p + (q - p) * (2 / 3 - t) * 6, p)),
+            )
+
+        data = self._data.copy()
+        data[:, :3] = _np.where(
+            (s == 0)[:, None],
+            _np.trunc(l * 255)[:, None],
+            _np.round(_np.stack((hue_to_rgb(h + 1 / 3), hue_to_rgb(h), hue_to_rgb(h - 1 / 3)), axis=1) * 255),
+        )
+        return ColorArray._from_data(data)
+
+
+class Palette:
+    """A palette of RGBA and HEXA colors with a spatial index (a k-d tree), so the palette colors nearest to any color
+    are found in sublinear time, instead of comparing the color to every single palette color.\n
+    -------------------------------------------------------------------------------------------------------------------------
+    The distance between two colors is their euclidean distance in the `space`:
+    - `rgb` the distance between the R G B channels
+    - `lab` the distance in the CIELAB color space (ΔE*76), which matches the perceived difference much better\n
+    The alpha channels are ignored.\n
+    -------------------------------------------------------------------------------------------------------------------------
+    Includes methods:
+    - `nearest(color, k)` to get the `k` palette colors nearest to a color
+    - `within(color, radius)` to get all palette colors within a distance of a color\n
+    Both return the same results as comparing the color to every palette color would, as list of `(key, color, distance)`
+    tuples, sorted by the distance (and the index in the palette, if the distance is the same).\n
+    -------------------------------------------------------------------------------------------------------------------------
+    The `colors` can be any colors, which `Color.to_rgba()` is able to convert (`rgba()` and `hexa()` colors are kept as
+    they are). If they're given as a dict (e.g. `DEFAULT.color`), the keys are the names, otherwise the indexes."""
+
+    __slots__ = ("_colors", "_keys", "_space", "_points", "_tree")
+
+    def __init__(self, colors: Iterable | dict, space: str = "rgb"):
+        if space not in ("rgb", "lab"):
+            raise ValueError(f"Invalid color space '{space}': expected 'rgb' or 'lab'")
+        self._keys = list(colors) if isinstance(colors, dict) else None
+        self._colors = [
+            color if isinstance(color, (rgba, hexa)) else Color.to_rgba(color)
+            for color in (colors.values() if isinstance(colors, dict) else colors)
+        ]
+        self._space = space
+        self._points = [self._point(color) for color in self._colors]
+        self._tree = self._build(list(range(len(self._points))))
+
+    def __len__(self):
+        return len(self._colors)
+
+    def __iter__(self):
+        return iter(self._colors)
+
+    def __getitem__(self, index: int) -> rgba | hexa:
+        return self._colors[index]
+
+    def __repr__(self):
+        return f"Palette({len(self)} colors, space='{self._space}')"
+
+    def nearest(self, color: rgba | hsla | hexa, k: int = 1) -> list[tuple[int | str, rgba | hexa, float]]:
+        """Returns the `k` palette colors nearest to the `color`, as list of `(key, color, distance)` tuples."""
+        if not (isinstance(k, int) and k >= 1):
+            raise ValueError("'k' must be an integer >= 1")
+        heap = []  # A MAX-HEAP OF THE `k` NEAREST COLORS SO FAR, STORED AS `(-distance², -index)`
+        self._nearest(self._tree, self._point(color), k, heap)
+        return self._results(sorted((-d2, -i) for d2, i in heap))
+
+    def within(self, color: rgba | hsla | hexa, radius: float) -> list[tuple[int | str, rgba | hexa, float]]:
+        """Returns all palette colors, which are at most `radius` away from the `color`, as list of
+        `(key, color, distance)` tuples."""
+        if not (isinstance(radius, (int, float)) and radius >= 0):
+            raise ValueError("'radius' must be a number >= 0")
+        query, r2, found = self._point(color), radius * radius, []
+        nodes = [self._tree]
+        while nodes:
+            node = nodes.pop()
+            if isinstance(node, list):
+                for i in node:
+                    x, y, z = self._points[i]
+                    if (d2 := (x - query[0]) ** 2 + (y - query[1]) ** 2 + (z - query[2]) ** 2) <= r2:
+                        found.append((d2, i))
+            else:
+                axis, value, lower, upper = node
+                diff = query[axis] - value
+                nodes.append(lower if diff < 0 else upper)
+                if diff * diff <= r2:
+                    nodes.append(upper if diff < 0 else lower)
+        return self._results(sorted(found))
+
+    def _point(self, color: rgba | hsla | hexa) -> tuple:
+        color = color if isinstance(color, (rgba, hexa)) else Color.to_rgba(color)
+        return _rgb_to_lab(color.r, color.g, color.b) if self._space == "lab" else (color.r, color.g, color.b)
+
+    def _nearest(self, node: list[int] | tuple, query: tuple, k: int, heap: list[tuple[float, int]]) -> None:
+        if isinstance(node, list):
+            for i in node:
+                x, y, z = self._points[i]
+                d2 = (x - query[0]) ** 2 + (y - query[1]) ** 2 + (z - query[2]) ** 2
+                if len(heap) < k:
+                    _heapq.heappush(heap, (-d2, -i))
+                elif (d2, i) < (-heap[0][0], -heap[0][1]):
+                    _heapq.heapreplace(heap, (-d2, -i))
+            return
+        axis, value, lower, upper = node
+        diff = query[axis] - value
+        self._nearest(lower if diff < 0 else upper, query, k, heap)
+        # THE FAR SIDE IS ONLY SKIPPED IF IT'S FARTHER AWAY THAN THE K-TH NEAREST, SO EQUAL DISTANCES AREN'T MISSED
+        if len(heap) < k or diff * diff <= -heap[0][0]:
+            self._nearest(upper if diff < 0 else lower, query, k, heap)
+
+    def _build(self, indexes: list[int]) -> list[int] | tuple:
+        """Builds the k-d tree over the points at the `indexes`: a leaf is a list of indexes and an inner node
+        a tuple `(axis, value, lower, upper)`, which splits the points at the `value` of the widest `axis`."""
+        if len(indexes) <= PALETTE_LEAF_SIZE:
+            return indexes
+        points = self._points
+        axis = max(range(3), key=lambda a: max(points[i][a] for i in indexes) - min(points[i][a] for i in indexes))
+        indexes.sort(key=lambda i: points[i][axis])
+        middle = len(indexes) // 2
+        return (axis, points[indexes[middle]][axis], self._build(indexes[:middle]), self._build(indexes[middle:]))
+
+    def _results(self, found: list[tuple[float, int]]) -> list[tuple[int | str, rgba | hexa, float]]:
+        return [(i if self._keys is None else self._keys[i], self._colors[i], d2**0.5) for d2, i in found]
+
+
+def _invalid(color: object) -> ValueError:
+    return ValueError(f"Invalid color format '{color}'")
+
+
+def _alpha(a: object) -> float | None | bool:
+    """Returns the normalized alpha channel, or `False` if it's not a valid alpha channel."""
+    if a is None:
+        return None
+    elif isinstance(a, (int, float)) and 0 <= a <= 1:
+        return float(a) or None
+    return False
+
+
+def _channels(color: tuple | list | dict) -> tuple:
+    """Returns the channels `x, y, z, a` of a tuple, list or dict color, with the alpha channel normalized."""
+    if isinstance(color, dict):
+        keys = ("r", "g", "b") if "r" in color else ("h", "s", "l")
+        if not all(key in color for key in keys):
+            raise _invalid(color)
+        return (*(color[key] for key in keys), _alpha(color.get("a")))
+    elif len(color) < 3:
+        raise _invalid(color)
+    return color[0], color[1], color[2], (_alpha(color[3]) if len(color) == 4 else None)
+
+
+def _fits(channels: tuple, x_max: int, y_max: int, z_max: int) -> bool:
+    x, y, z, a = channels
+    return (
+        a is not False
+        and isinstance(x, int)
+        and isinstance(y, int)
+        and isinstance(z, int)
+        and 0 <= x <= x_max
+        and 0 <= y <= y_max
+        and 0 <= z <= z_max
+    )
+
+
+def _rgba_from(channels: tuple) -> rgba | None:
+    """Returns the channels as a `rgba()` color, if they're a valid RGBA color."""
+    return rgba._from_trusted(*channels) if _fits(channels, 255, 255, 255) else None
+
+
+def _hsla_from(channels: tuple) -> hsla | None:
+    """Returns the channels as a `hsla()` color, if they're a valid HSLA color."""
+    return hsla._from_trusted(*channels) if _fits(channels, 360, 100, 100) else None
+
+
+def _match_channels(pattern: _re.Pattern, color: str) -> tuple | None:
+    """Returns the channels `x, y, z, a` of an RGBA or HSLA color string, if it fully matches the `pattern`."""
+    if not (match := pattern.fullmatch(color)):
+        return None
+    x, y, z, a = match.groups()
+    return int(x), int(y), int(z), (_alpha(int(a) if "." not in a else float(a)) if a else None)
+
+
+def _hexa_from(color: str | int) -> hexa | None:
+    """Returns the color as a `hexa()` color, if it's a valid HEXA color string or integer."""
+    if isinstance(color, int):
+        return hexa.from_int(color) if 0 <= color <= 0xFFFFFFFF else None
+    stripped = color[1:] if color.startswith("#") else color[2:] if color.startswith("0x") else color
+    return hexa(color) if Regex.compiled("hexa_str").fullmatch(stripped) else None
+
+
+# THE `Color.to_*()` METHODS LOOK UP THE EXACT INPUT TYPE IN THE `registry` FIRST, SINCE THE
+# FULL `singledispatch` CALL (WHICH ALSO RESOLVES SUBCLASSES) COSTS MORE THAN MOST CONVERSIONS
+@_singledispatch
+def _to_rgba(color: object) -> rgba:
+    raise _invalid(color)
+
+
+@_to_rgba.register(rgba)
+def _(color: rgba) -> rgba:
+    return color
+
+
+@_to_rgba.register(hsla)
+@_to_rgba.register(hexa)
+def _(color: hsla | hexa) -> rgba:
+    return color.to_rgba()
+
+
+@_to_rgba.register(tuple)
+@_to_rgba.register(list)
+@_to_rgba.register(dict)
+def _(color: tuple | list | dict) -> rgba:
+    channels = _channels(color)
+    if isinstance(color, dict):
+        clr = _rgba_from(channels) if "r" in color else _hsla_from(channels)
+    else:  # A TUPLE WHICH IS A VALID HSLA AND RGBA COLOR, COUNTS AS HSLA COLOR
+        clr = _hsla_from(channels) or _rgba_from(channels)
+    if clr is None:
+        raise _invalid(color)
+    return clr if isinstance(clr, rgba) else clr.to_rgba()
+
+
+@_to_rgba.register(str)
+@_to_rgba.register(int)
+def _(color: str | int) -> rgba:
+    if clr := _hexa_from(color):
+        return clr.to_rgba()
+    elif isinstance(color, str):
+        if (channels := _match_channels(Regex.compiled("hsla_str"), color)) and (clr := _hsla_from(channels)):
+            return clr.to_rgba()
+        elif (channels := _match_channels(Regex.compiled("rgba_str"), color)) and (clr := _rgba_from(channels)):
+            return clr
+    raise _invalid(color)
+
+
+@_singledispatch
+def _to_hsla(color: object) -> hsla:
+    raise _invalid(color)
+
+
+@_to_hsla.register(hsla)
+def _(color: hsla) -> hsla:
+    return color
+
+
+@_to_hsla.register(rgba)
+@_to_hsla.register(hexa)
+def _(color: rgba | hexa) -> hsla:
+    return color.to_hsla()
+
+
+@_to_hsla.register(tuple)
+@_to_hsla.register(list)
+@_to_hsla.register(dict)
+def _(color: tuple | list | dict) -> hsla:
+    channels = _channels(color)
+    if isinstance(color, dict):
+        clr = _rgba_from(channels) if "r" in color else _hsla_from(channels)
+    else:  # A TUPLE WHICH IS A VALID RGBA AND HSLA COLOR, COUNTS AS RGBA COLOR
+        clr = _rgba_from(channels) or _hsla_from(channels)
+    if clr is None:
+        raise _invalid(color)
+    return clr if isinstance(clr, hsla) else clr.to_hsla()
+
+
+@_to_hsla.register(str)
+@_to_hsla.register(int)
+def _(color: str | int) -> hsla:
+    if clr := _hexa_from(color):
+        return clr.to_hsla()
+    elif isinstance(color, str):
+        if (channels := _match_channels(Regex.compiled("rgba_str"), color)) and (clr := _rgba_from(channels)):
+            return clr.to_hsla()
+        elif (channels := _match_channels(Regex.compiled("hsla_str"), color)) and (clr := _hsla_from(channels)):
+            return clr
+    raise _invalid(color)
+
+
+@_singledispatch
+def _to_hexa(color: object) -> hexa:
+    raise _invalid(color)
+
+
+@_to_hexa.register(hexa)
+def _(color: hexa) -> hexa:
+    return color
+
+
+@_to_hexa.register(rgba)
+@_to_hexa.register(hsla)
+def _(color: rgba | hsla) -> hexa:
+    return color.to_hexa()
+
+
+@_to_hexa.register(tuple)
+@_to_hexa.register(list)
+@_to_hexa.register(dict)
+def _(color: tuple | list | dict) -> hexa:
+    channels = _channels(color)
+    if isinstance(color, dict):
+        clr = _rgba_from(channels) if "r" in color else _hsla_from(channels)
+    else:  # A TUPLE WHICH IS A VALID RGBA AND HSLA COLOR, COUNTS AS RGBA COLOR
+        clr = _rgba_from(channels) or _hsla_from(channels)
+    if clr is None:
+        raise _invalid(color)
+    return clr.to_hexa()
+
+
+@_to_hexa.register(str)
+@_to_hexa.register(int)
+def _(color: str | int) -> hexa:
+    if clr := _hexa_from(color):
+        return clr
+    elif isinstance(color, str):
+        if (channels := _match_channels(Regex.compiled("rgba_str"), color)) and (clr := _rgba_from(channels)):
+            return clr.to_hexa()
+        elif (channels := _match_channels(Regex.compiled("hsla_str"), color)) and (clr := _hsla_from(channels)):
+            return clr.to_hexa()
+    raise _invalid(color)
+
+
+@_lru_cache(maxsize=None)
+def _colors_pattern(formats: tuple[str, ...], binary: bool) -> _re.Pattern:
+    """Returns the combined pattern, which finds the colors of all the `formats` in a text (or bytes, if `binary`)."""
+    pattern = "(?i)" + "|".join(COLOR_PATTERNS[fmt] for fmt in formats)
+    return _re.compile(pattern.encode() if binary else pattern)
+
+
+def _color_from_match(match: _re.Match) -> rgba | hsla | hexa | None:
+    """Returns the color, which the combined colors pattern matched, or `None` if its channels are out of range."""
+    if (fmt := match.lastgroup) == "hexa":
+        digits = match.group("hex")
+        value = int(digits, 16)
+        if len(digits) == 3:  # RGB
+            return hexa._from_trusted((value >> 8) * 17, (value >> 4 & 15) * 17, (value & 15) * 17, None)
+        elif len(digits) == 4:  # RGBA
+            return hexa._from_trusted(
+                (value >> 12) * 17, (value >> 8 & 15) * 17, (value >> 4 & 15) * 17, (value & 15) * 17 / 255.0
+            )
+        elif len(digits) == 6:  # RRGGBB
+            return hexa._from_trusted(value >> 16, value >> 8 & 255, value & 255, None)
+        return hexa._from_trusted(value >> 24, value >> 16 & 255, value >> 8 & 255, (value & 255) / 255.0)  # RRGGBBAA
+    x, y, z, a = match.group(*(("r", "g", "b", "ra") if fmt == "rgba" else ("h", "s", "l", "ha")))
+    channels = (int(x), int(y), int(z), _alpha(float(a)) if a else None)
+    return _rgba_from(channels) if fmt == "rgba" else _hsla_from(channels)
+
+
+def _iter_color_matches(text: str | bytes, formats: tuple[str, ...]) -> Iterator[tuple[rgba | hsla | hexa, tuple[int, int]]]:
+    for match in _colors_pattern(formats, not isinstance(text, str)).finditer(text):
+        if (color := _color_from_match(match)) is not None:
+            yield color, match.span()
+
+
+def _iter_colors(
+    text_or_file: str | bytes | IO | _os.PathLike, formats: tuple[str, ...]
+) -> Iterator[tuple[rgba | hsla | hexa, tuple[int, int]]]:
+    """The generator behind `Color.iter_colors()`, for already checked `formats`."""
+    if isinstance(text_or_file, _os.PathLike):
+        with open(text_or_file, "rb") as file:
+            yield from _iter_colors(file, formats)
+        return
+    if isinstance(text_or_file, (str, bytes, bytearray, memoryview, _mmap.mmap)):
+        yield from _iter_color_matches(text_or_file, formats)
+        return
+    try:
+        fileno = text_or_file.fileno()
+    except (AttributeError, OSError):  # E.g. `io.StringIO`, WHICH IS ALREADY IN MEMORY ANYWAY
+        yield from _iter_color_matches(text_or_file.read(), formats)
+        return
+    if _os.fstat(fileno).st_size == 0:  # AN EMPTY FILE CAN'T BE MEMORY-MAPPED
+        return
+    with _mmap.mmap(fileno, 0, access=_mmap.ACCESS_READ) as data:
+        yield from _iter_color_matches(data, formats)
+
+
+def _is_single_color(color: object) -> bool:
+    """Returns `True` if the `color` is one color and not many colors (a non-empty tuple or list of numbers counts as one color)."""
+    return isinstance(color, (rgba, hsla, hexa, str, int, dict)) or (
+        isinstance(color, (tuple, list)) and len(color) > 0 and all(x is None or isinstance(x, (int, float)) for x in color)
+    )
+
+
+def _rgb_rows(colors: ColorArray | Iterable) -> list[tuple[int, int, int]]:
+    """Returns the R G B channels of many colors (any colors, which `Color.to_rgba()` is able to convert)."""
+    if isinstance(colors, ColorArray):
+        return [(int(r), int(g), int(b)) for r, g, b, _ in colors._rows()]
+    return [
+        (color.r, color.g, color.b)
+        for color in (color if isinstance(color, (rgba, hexa)) else Color.to_rgba(color) for color in colors)
+    ]
+
+
 class Color:
 
     @staticmethod
@@ -655,7 +1374,7 @@ class Color:
                     )
                 return 0 <= color["r"] <= 255 and 0 <= color["g"] <= 255 and 0 <= color["b"] <= 255
             elif isinstance(color, str):
-                return bool(_re.fullmatch(Regex.rgba_str(allow_alpha=allow_alpha), color))
+                return bool(Regex.compiled("rgba_str", allow_alpha=allow_alpha).fullmatch(color))
             return False
         except Exception:
             return False
@@ -686,7 +1405,7 @@ class Color:
                 else:
                     return 0 <= color["h"] <= 360 and 0 <= color["s"] <= 100 and 0 <= color["l"] <= 100
             elif isinstance(color, str):
-                return bool(_re.fullmatch(Regex.hsla_str(allow_alpha=allow_alpha), color))
+                return bool(Regex.compiled("hsla_str", allow_alpha=allow_alpha).fullmatch(color))
         except Exception:
             return False
 
@@ -705,9 +1424,9 @@ class Color:
                     else (color[2:], "0x") if color.startswith("0x") else (color, None)
                 )
                 return (
-                    (bool(_re.fullmatch(Regex.hexa_str(allow_alpha=allow_alpha), color)), prefix)
+                    (bool(Regex.compiled("hexa_str", allow_alpha=allow_alpha).fullmatch(color)), prefix)
                     if get_prefix
-                    else bool(_re.fullmatch(Regex.hexa_str(allow_alpha=allow_alpha), color))
+                    else bool(Regex.compiled("hexa_str", allow_alpha=allow_alpha).fullmatch(color))
                 )
         except Exception:
             return (False, None) if get_prefix else False
@@ -744,50 +1463,24 @@ class Color:
 
     @staticmethod
     def to_rgba(color: hsla | hexa) -> rgba:
-        """Will try to convert any color type to a color of type RGBA."""
-        if isinstance(color, (hsla, hexa)):
-            return color.to_rgba()
-        elif Color.is_valid_hsla(color):
-            return hsla(*color).to_rgba() if Color.has_alpha(color) else hsla(color[0], color[1], color[2]).to_rgba()
-        elif Color.is_valid_hexa(color):
-            return hexa(color).to_rgba()
-        elif Color.is_valid_rgba(color):
-            return (
-                color
-                if isinstance(color, rgba)
-                else (rgba(*color) if Color.has_alpha(color) else rgba(color[0], color[1], color[2]))
-            )
-        raise ValueError(f"Invalid color format '{color}'")
+        """Will try to convert any color type to a color of type RGBA.\n
+        ----------------------------------------------------------------------------------------
+        A tuple, list or string, which is a valid HSLA and RGBA color, counts as HSLA color."""
+        return _to_rgba.registry.get(type(color), _to_rgba)(color)
 
     @staticmethod
     def to_hsla(color: rgba | hexa) -> hsla:
-        """Will try to convert any color type to a color of type HSLA."""
-        if isinstance(color, (rgba, hexa)):
-            return color.to_hsla()
-        elif Color.is_valid_rgba(color):
-            return rgba(*color).to_hsla() if Color.has_alpha(color) else rgba(color[0], color[1], color[2]).to_hsla()
-        elif Color.is_valid_hexa(color):
-            return hexa(color).to_hsla()
-        elif Color.is_valid_hsla(color):
-            return (
-                color
-                if isinstance(color, hsla)
-                else (hsla(*color) if Color.has_alpha(color) else hsla(color[0], color[1], color[2]))
-            )
-        raise ValueError(f"Invalid color format '{color}'")
+        """Will try to convert any color type to a color of type HSLA.\n
+        ----------------------------------------------------------------------------------------
+        A tuple, list or string, which is a valid RGBA and HSLA color, counts as RGBA color."""
+        return _to_hsla.registry.get(type(color), _to_hsla)(color)
 
     @staticmethod
     def to_hexa(color: rgba | hsla) -> hexa:
-        """Will try to convert any color type to a color of type HEXA."""
-        if isinstance(color, (rgba, hsla)):
-            return color.to_hexa()
-        elif Color.is_valid_rgba(color):
-            return rgba(*color).to_hexa() if Color.has_alpha(color) else rgba(color[0], color[1], color[2]).to_hexa()
-        elif Color.is_valid_hsla(color):
-            return hsla(*color).to_hexa() if Color.has_alpha(color) else hsla(color[0], color[1], color[2]).to_hexa()
-        elif Color.is_valid_hexa(color):
-            return color if isinstance(color, hexa) else hexa(f"#{color}")
-        raise ValueError(f"Invalid color format '{color}'")
+        """Will try to convert any color type to a color of type HEXA.\n
+        ----------------------------------------------------------------------------------------
+        A tuple, list or string, which is a valid RGBA and HSLA color, counts as RGBA color."""
+        return _to_hexa.registry.get(type(color), _to_hexa)(color)
 
     @staticmethod
     def str_to_rgba(string: str, only_first: bool = False) -> rgba | list[rgba] | None:
@@ -795,7 +1488,7 @@ class Color:
         --------------------------------------------------------------------------------------------------
         If `only_first` is `True` only the first found color will be returned (not as a list)."""
         if only_first:
-            match = _re.search(Regex.rgb_str(allow_alpha=True), string)
+            match = Regex.compiled("rgba_str", allow_alpha=True).search(string)
             if not match:
                 return None
             m = match.groups()
@@ -806,7 +1499,7 @@ class Color:
                 ((int(m[3]) if "." not in m[3] else float(m[3])) if m[3] else None),
             )
         else:
-            matches = _re.findall(Regex.rgb_str(allow_alpha=True), string)
+            matches = Regex.compiled("rgba_str", allow_alpha=True).findall(string)
             if not matches:
                 return None
             return [
@@ -819,6 +1512,27 @@ class Color:
                 for m in matches
             ]
 
+    @staticmethod
+    def iter_colors(
+        text_or_file: str | bytes | IO | _os.PathLike,
+        formats: tuple[str, ...] = ("rgba", "hsla", "hexa"),
+    ) -> Iterator[tuple[rgba | hsla | hexa, tuple[int, int]]]:
+        """Will find all colors of the `formats` inside a text or file and yield them one by one, as tuple of
+        the color and its span `(start, end)` inside the text.\n
+        --------------------------------------------------------------------------------------------------------
+        The colors are found in these formats (case insensitive, with any whitespace around the channels):
+        - `rgba` → `rgb(r, g, b)` or `rgba(r, g, b, a)` as `rgba()` color
+        - `hsla` → `hsl(h, s, l)` or `hsla(h, s, l, a)` (`s` and `l` with optional `%`) as `hsla()` color
+        - `hexa` → `#RGB`, `#RGBA`, `#RRGGBB` or `#RRGGBBAA` as `hexa()` color\n
+        Colors with channels outside their valid ranges are skipped.\n
+        --------------------------------------------------------------------------------------------------------
+        `text_or_file` can be a string, bytes, a path (as `os.PathLike`, since a `str` is always the text) or
+        an opened file. Files are memory-mapped and searched directly, so even huge files are searched in a
+        single pass without reading them into memory. For bytes and files, the spans are byte offsets."""
+        if unknown := [fmt for fmt in formats if fmt not in COLOR_PATTERNS]:
+            raise ValueError(f"Unknown color formats {unknown}: expected any of {list(COLOR_PATTERNS)}")
+        return _iter_colors(text_or_file, tuple(fmt for fmt in COLOR_PATTERNS if fmt in formats))
+
     @staticmethod
     def rgba_to_hex_int(
         r: int,
@@ -859,25 +1573,13 @@ class Color:
         ⇾ You can disable this behavior by setting `preserve_original` to `True`"""
         if not isinstance(hex_int, int):
             raise ValueError("Input must be an integer")
-        hex_str = f"{hex_int:x}"
-        if len(hex_str) <= 6:
-            hex_str = hex_str.zfill(6)
-            return (
-                r if (r := int(hex_str[0:2], 16)) != 1 or preserve_original else 0,
-                int(hex_str[2:4], 16),
-                int(hex_str[4:6], 16),
-                None,
-            )
-        elif len(hex_str) <= 8:
-            hex_str = hex_str.zfill(8)
-            return (
-                r if (r := int(hex_str[0:2], 16)) != 1 or preserve_original else 0,
-                int(hex_str[2:4], 16),
-                int(hex_str[4:6], 16),
-                int(hex_str[6:8], 16) / 255.0,
-            )
+        elif 0 <= hex_int <= 0xFFFFFF:
+            r, g, b, a = hex_int >> 16, (hex_int >> 8) & 0xFF, hex_int & 0xFF, None
+        elif 0 <= hex_int <= 0xFFFFFFFF:
+            r, g, b, a = hex_int >> 24, (hex_int >> 16) & 0xFF, (hex_int >> 8) & 0xFF, (hex_int & 0xFF) / 255.0
         else:
-            raise ValueError(f"Invalid HEX integer '0x{hex_str}': expected in range [0x000000, 0xFFFFFF]")
+            raise ValueError(f"Invalid HEX integer '0x{hex_int:x}': expected in range [0x000000, 0xFFFFFF]")
+        return (r if r != 1 or preserve_original else 0), g, b, a
 
     @staticmethod
     def luminance(r: int, g: int, b: int, output_type: type = None) -> int | float:
@@ -887,22 +1589,58 @@ class Color:
         - `int`   =⠀integer in [0, 100]
         - `float` =⠀float in [0.0, 1.0]
         - `None`  =⠀integer in [0, 255]"""
-        r, g, b = r / 255.0, g / 255.0, b / 255.0
-        if r < 0.03928:
-            r = r / 12.92
-        else:
-            r = ((r + 0.055) / 1.055) ** 2.4
-        if g < 0.03928:
-            g = g / 12.92
+        if type(r) is type(g) is type(b) is int and 0 <= r <= 255 and 0 <= g <= 255 and 0 <= b <= 255:
+            r, g, b = SRGB_TO_LINEAR[r], SRGB_TO_LINEAR[g], SRGB_TO_LINEAR[b]
         else:
-            g = ((g + 0.055) / 1.055) ** 2.4
-        if b < 0.03928:
-            b = b / 12.92
-        else:
-            b = ((b + 0.055) / 1.055) ** 2.4
+            r, g, b = _srgb_to_linear(r / 255.0), _srgb_to_linear(g / 255.0), _srgb_to_linear(b / 255.0)
         l = 0.2126 * r + 0.7152 * g + 0.0722 * b
         return round(l * 100) if isinstance(output_type, int) else round(l * 255) if output_type is None else l
 
+    @staticmethod
+    def luminance_many(colors: ColorArray | Iterable) -> "list[float] | _np.ndarray":
+        """Gets the relative luminance (float in [0.0, 1.0], like `Color.luminance(r, g, b, float)`) of many colors
+        at once, using the precomputed `SRGB_TO_LINEAR` table instead of calculating the gamma correction.\n
+        ---------------------------------------------------------------------------------------------------------------
+        The `colors` can be a `ColorArray` or any colors, which `Color.to_rgba()` is able to convert.
+        If NumPy is installed, the luminances are calculated vectorized and returned as NumPy array, otherwise as list.
+        """
+        table = SRGB_TO_LINEAR
+        if _np is None:
+            return [0.2126 * table[r] + 0.7152 * table[g] + 0.0722 * table[b] for r, g, b in _rgb_rows(colors)]
+        if isinstance(colors, ColorArray):
+            rgb = colors._data[:, :3].astype(_np.intp)
+        else:
+            rgb = _np.array(_rgb_rows(colors), dtype=_np.intp).reshape(-1, 3)
+        linear = _np.array(table)[rgb]
+        return 0.2126 * linear[:, 0] + 0.7152 * linear[:, 1] + 0.0722 * linear[:, 2]
+
+    @staticmethod
+    def contrast_ratio_many(
+        fg: ColorArray | Iterable,
+        bg: ColorArray | Iterable,
+        large_text: bool = False,
+    ) -> "tuple[list[float], list[bool], list[bool]] | tuple[_np.ndarray, _np.ndarray, _np.ndarray]":
+        """Gets the WCAG 2 contrast ratio (float in [1.0, 21.0]) of many pairs of foreground and background colors
+        at once and checks them against the WCAG levels AA and AAA.\n
+        ---------------------------------------------------------------------------------------------------------------
+        `fg` and `bg` can each be a `ColorArray`, many colors of the same length, or a single color, which is then
+        paired with all colors on the other side (a tuple or list of numbers counts as single color).\n
+        ---------------------------------------------------------------------------------------------------------------
+        Returns a tuple `(ratios, passes_aa, passes_aaa)`, where `passes_aa` and `passes_aaa` tell for each pair,
+        if its ratio reaches the minimum ratio of the level (see `WCAG_CONTRAST`, for `large_text` the lower minimum
+        ratios of large text are used). If NumPy is installed, they're NumPy arrays, otherwise lists."""
+        fg_l, bg_l = (Color.luminance_many([c] if _is_single_color(c) else c) for c in (fg, bg))
+        if len(fg_l) != len(bg_l) and 1 not in (len(fg_l), len(bg_l)):
+            raise ValueError(f"'fg' and 'bg' must have the same amount of colors: got {len(fg_l)} and {len(bg_l)}")
+        aa, aaa = (WCAG_CONTRAST[level + ("_large" if large_text else "")] for level in ("AA", "AAA"))
+        if _np is None:
+            amount = max(len(fg_l), len(bg_l))
+            fg_l, bg_l = (l * amount if len(l) == 1 else l for l in (fg_l, bg_l))
+            ratios = [(max(f, b) + 0.05) / (min(f, b) + 0.05) for f, b in zip(fg_l, bg_l)]
+            return ratios, [ratio >= aa for ratio in ratios], [ratio >= aaa for ratio in ratios]
+        ratios = (_np.maximum(fg_l, bg_l) + 0.05) / (_np.minimum(fg_l, bg_l) + 0.05)
+        return ratios, ratios >= aa, ratios >= aaa
+
     @staticmethod
     def text_color_for_on_bg(
         text_bg_color: rgba | hexa = "#FFF",
@@ -953,3 +1691,79 @@ class Color:
         )
         s = int(max(0, min(100, s + saturation_change * 100)))
         return Color.to_hexa((h, s, l, a)) if was_hexa else Color.to_rgba((h, s, l, a))
+
+    @staticmethod
+    def gradient(start: rgba | hsla | hexa, end: rgba | hsla | hexa, steps: int, space: str = "rgb") -> ColorArray:
+        """Returns the gradient from the `start` to the `end` color (both included) in `steps` colors.\n
+        ------------------------------------------------------------------------------------------------
+        The colors are interpolated in the `space`:
+        - `rgb` the R G B channels are interpolated linearly
+        - `hsl` the H S L channels are interpolated linearly (the hue along the shorter way around
+          the color wheel), which keeps the colors in between more saturated\n
+        ------------------------------------------------------------------------------------------------
+        This is the same as `Color.gradient_stops([start, end], steps, space)`."""
+        return Color.gradient_stops((start, end), steps, space)
+
+    @staticmethod
+    def gradient_stops(stops: Iterable, steps: int, space: str = "rgb") -> ColorArray:
+        """Returns the gradient through all the color `stops` in `steps` colors, as `ColorArray`.\n
+        ---------------------------------------------------------------------------------------------------------
+        The `stops` can either be colors, which are then evenly distributed along the gradient, or
+        `(position, color)` pairs, where the positions go from `0.0` (the start) to `1.0` (the end) in
+        ascending order. Before the first and after the last stop, the gradient keeps the stop's color.\n
+        ---------------------------------------------------------------------------------------------------------
+        The `space` is either `rgb` or `hsl` (see `Color.gradient()`). If any stop has an alpha channel,
+        the alpha channel is interpolated as well (stops without alpha channel count as fully opaque).\n
+        ---------------------------------------------------------------------------------------------------------
+        If NumPy is installed, all colors are calculated in one vectorized pass, otherwise one by one,
+        but either way, the results are exactly the same."""
+        if space not in ("rgb", "hsl"):
+            raise ValueError(f"Invalid color space '{space}': expected 'rgb' or 'hsl'")
+        elif not (isinstance(steps, int) and steps >= 1):
+            raise ValueError("'steps' must be an integer >= 1")
+        stops = list(stops)
+        if not stops:
+            raise ValueError("A gradient needs at least one color stop")
+        elif all(isinstance(stop, (tuple, list)) and len(stop) == 2 for stop in stops):
+            positions, colors = [float(pos) for pos, _ in stops], [Color.to_rgba(color) for _, color in stops]
+            if any(not 0 <= pos <= 1 for pos in positions) or positions != sorted(positions):
+                raise ValueError("The positions of the color stops must be in [0.0, 1.0] and in ascending order")
+        else:
+            colors = [Color.to_rgba(color) for color in stops]
+            positions = [i / (len(colors) - 1) for i in range(len(colors))] if len(colors) > 1 else [0.0]
+        if len(colors) == 1:  # A SINGLE STOP IS THE SAME AS A GRADIENT FROM AND TO THAT COLOR
+            positions, colors = positions * 2, colors * 2
+        has_alpha = any(color.a is not None for color in colors)
+        channels = [
+            (*(_rgb_to_hsl(c.r, c.g, c.b) if space == "hsl" else (c.r, c.g, c.b)), (1.0 if c.a is None else c.a))
+            for c in colors
+        ]
+        if space == "hsl":  # INTERPOLATE THE HUE ALONG THE SHORTER WAY AROUND THE COLOR WHEEL
+            for i in range(1, len(channels)):
+                prev_h, (h, s, l, a) = channels[i - 1][0], channels[i]
+                channels[i] = (prev_h + (h - prev_h + 180) % 360 - 180, s, l, a)
+        if _np is None:
+            data, nan = _array.array("d"), float("nan")
+            for step in range(steps):
+                t = step / (steps - 1) if steps > 1 else 0.0
+                i = min(
+                    max(next((i for i, pos in enumerate(positions) if pos > t), len(positions)) - 1, 0), len(positions) - 2
+                )
+                width = positions[i + 1] - positions[i]
+                u = min(max((t - positions[i]) / width, 0.0), 1.0) if width else 1.0
+                x, y, z, a = (v0 + (v1 - v0) * u for v0, v1 in zip(channels[i], channels[i + 1]))
+                rgb = _hsl_to_rgb(round(x) % 360, round(y), round(z)) if space == "hsl" else (round(x), round(y), round(z))
+                data.extend((*rgb, (a or nan) if has_alpha else nan))
+            return ColorArray._from_data(data)
+        positions, channels = _np.array(positions), _np.array(channels, dtype=float)
+        t = _np.arange(steps) / (steps - 1) if steps > 1 else _np.zeros(1)
+        i = _np.clip(_np.searchsorted(positions, t, side="right") - 1, 0, len(positions) - 2)
+        width = positions[i + 1] - positions[i]
+        with _np.errstate(divide="ignore", invalid="ignore"):
+            u = _np.where(width > 0, _np.clip((t - positions[i]) / width, 0.0, 1.0), 1.0)
+        values = channels[i] + (channels[i + 1] - channels[i]) * u[:, None]
+        data = _np.round(values)
+        data[:, 3] = _np.where(values[:, 3] > 0, values[:, 3], _np.nan) if has_alpha else _np.nan
+        if space == "rgb":
+            return ColorArray._from_data(data)
+        return ColorArray._from_data(data)._with_hsl(data[:, 0] % 360, data[:, 1], data[:, 2])
@@ -88,9 +88,11 @@ class Console:
     ) -> None:
         """Will print the `last_prompt` and then pause the program if `pause` is set
         to `True` and after the pause, exit the program if `exit` is set to `True`."""
+        FormatCodes.Buffer.flush_active()
         print(prompt, end="", flush=True)
         if reset_ansi:
             FormatCodes.print("[_]", end="")
+            FormatCodes.Buffer.flush_active()
         if pause:
             _keyboard.read_event()
         if exit:
@@ -98,6 +100,7 @@ class Console:
 
     def cls() -> None:
         """Will clear the console in addition to completely resetting the ANSI formats."""
+        FormatCodes.Buffer.flush_active()
         if _shutil.which("cls"):
             _os.system("cls")
         elif _shutil.which("clear"):
@@ -243,6 +246,7 @@ class Console:
         -------------------------------------------------------------------------------
         The question can be formatted with special formatting codes. For more detailed
         information about formatting codes, see the `xx_format_codes` description."""
+        FormatCodes.Buffer.flush_active()
         confirmed = input(
             FormatCodes.to_ansi(
                 f'{start}  {str(prompt)} [_|dim](({"Y" if default_is_yes else "y"}/{"n" if default_is_yes else "N"}):  )',
@@ -271,17 +275,18 @@ class Console:
         The input can be formatted with special formatting codes. For more detailed
         information about formatting codes, see the `xx_format_codes` description."""
         FormatCodes.print(prompt, end="", flush=True)
+        FormatCodes.Buffer.flush_active()  # THE INPUT IS REDRAWN DIRECTLY ON THE CONSOLE, BEHIND THE PROMPT
         result = ""
         select_all = False
         last_line_count = 1
         last_console_width = 0
+        prompt_ansi = FormatCodes.to_ansi(str(prompt)) if prompt else ""
+        prompt_width = FormatCodes.visible_len(prompt_ansi)  # ONLY THE VISIBLE PROMPT TAKES UP SPACE IN THE CONSOLE
 
         def update_display(console_width: int) -> None:
             nonlocal select_all, last_line_count, last_console_width
-            lines = String.split_count(
-                str(prompt) + (mask_char * len(result) if mask_char else result),
-                console_width,
-            )
+            # THE PROMPT ONLY COUNTS WITH ITS WIDTH, BECAUSE ONLY THE INPUT IS TAKEN FROM THE SPLIT LINES
+            lines = String.split_count(" " * prompt_width + (mask_char * len(result) if mask_char else result), console_width)
             line_count = len(lines)
             if (line_count > 1 or line_count < last_line_count) and not last_line_count == 1:
                 if last_console_width > console_width:
@@ -292,13 +297,8 @@ class Console:
                     else (line_count - 2 if line_count > last_line_count else line_count - 1)
                 ):
                     _sys.stdout.write("\033[2K\r\033[A")
-            prompt_len = len(str(prompt)) if prompt else 0
-            prompt_str, input_str = lines[0][:prompt_len], (
-                lines[0][prompt_len:] if len(lines) == 1 else "\n".join([lines[0][prompt_len:]] + lines[1:])
-            )  # SEPARATE THE PROMPT AND THE INPUT
-            _sys.stdout.write(
-                "\033[2K\r" + FormatCodes.to_ansi(prompt_str) + ("\033[7m" if select_all else "") + input_str + "\033[27m"
-            )
+            input_str = "\n".join(lines)[prompt_width + prompt_width // console_width :]  # ONLY THE INPUT
+            _sys.stdout.write("\033[2K\r" + prompt_ansi + ("\033[7m" if select_all else "") + input_str + "\033[27m")
             last_line_count, last_console_width = line_count, console_width
 
         def handle_enter():
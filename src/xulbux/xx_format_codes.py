@@ -3,7 +3,13 @@ Functions to be able to use special (easy) formatting codes directly inside some
 These codes, when used within following functions, will change the look of log within the console:
 - `FormatCodes.print()` (print a special format-codes containing string)
 - `FormatCodes.input()` (input with a special format-codes containing prompt)
-- `FormatCodes.to_ansi()` (transform all special format-codes into ANSI codes in a string)\n
+- `FormatCodes.buffered()` (collect the output of `FormatCodes.print()` and write it in batches)
+- `FormatCodes.to_ansi()` (transform all special format-codes into ANSI codes in a string)
+- `FormatCodes.iter_ansi()` (transform all special format-codes in a text, given in chunks)
+- `FormatCodes.from_ansi()` (transform the ANSI codes in a string back into special format-codes)
+- `FormatCodes.optimize_ansi()` (remove all ANSI codes from a string, which don't change how it looks)
+- `FormatCodes.Stream` (a file-like object, which transforms all special format-codes written to it)
+- `FormatCodes.terminal_support()` (get information about what the terminal supports)\n
 --------------------------------------------------------------------------------------------------------------------
 How to change the text format and color?\n
 Example string with formatting codes:
@@ -86,13 +92,23 @@ Per default, you can also use `+` and `-` to get lighter and darker `default_col
 """
 
 from ._consts_ import ANSI
-from .xx_string import String
 from .xx_regex import Regex
 from .xx_color import *
 
+from typing import Iterable, Iterator, IO
 from functools import lru_cache
+from operator import add as _add
+from itertools import islice as _islice, repeat as _repeat
+import concurrent.futures as _futures
 import ctypes as _ctypes
+import os as _os
+import atexit as _atexit
+import unicodedata as _unicodedata
+import threading as _threading
+import string as _string
+import math as _math
 import regex as _rx
+import time as _time
 import sys as _sys
 import re as _re
 
@@ -105,12 +121,58 @@ PREFIX_RX = {
     "BG": rf"(?:{'|'.join(PREFIX['BG'])})\s*:",
     "BR": rf"(?:{'|'.join(PREFIX['BR'])})\s*:",
 }
+ANSI_SEQ = {  # FLAT LOOKUP TABLE FOR ALL NORMALIZED FORMAT KEYS WITH A FIXED ANSI SEQUENCE
+    key: ANSI.seq().format(code)
+    for keys, code in ANSI.codes_map.items()
+    for key in (keys if isinstance(keys, tuple) else (keys,))
+}
+COLOR_DEPTHS = ("truecolor", "256", "16", "none")
+TEMPLATE_GUARD_CHARS = frozenset("()\"'\n")  # CHARS IN A TEMPLATE VALUE BEHIND A `](`, WHICH CAN CHANGE AN AUTO-RESET TEXT
+XTERM_16 = (  # RGB VALUES OF THE 16 STANDARD CONSOLE COLORS IN XTERM
+    (0, 0, 0),
+    (205, 0, 0),
+    (0, 205, 0),
+    (205, 205, 0),
+    (0, 0, 238),
+    (205, 0, 205),
+    (0, 205, 205),
+    (229, 229, 229),
+    (127, 127, 127),
+    (255, 0, 0),
+    (0, 255, 0),
+    (255, 255, 0),
+    (92, 92, 255),
+    (255, 0, 255),
+    (0, 255, 255),
+    (255, 255, 255),
+)
+XTERM_256 = (  # RGB VALUES OF THE XTERM 256 COLORS: THE 16 STANDARD COLORS, A 6×6×6 COLOR CUBE AND 24 GRAYS
+    XTERM_16
+    + tuple(
+        (r, g, b)
+        for r in (0, 95, 135, 175, 215, 255)
+        for g in (0, 95, 135, 175, 215, 255)
+        for b in (0, 95, 135, 175, 215, 255)
+    )
+    + tuple((v, v, v) for v in range(8, 239, 10))
+)
 COMPILED = {  # PRECOMPILE REGULAR EXPRESSIONS
     "*": _re.compile(r"\[\s*([^]_]*?)\s*\*\s*([^]_]*?)\]"),
     "*color": _re.compile(r"\[\s*([^]_]*?)\s*\*color\s*([^]_]*?)\]"),
     "format": _rx.compile(
         Regex.brackets("[", "]", is_group=True) + r"(?:\s*([/\\]?)\s*" + Regex.brackets("(", ")", is_group=True) + r")?"
     ),
+    "ansi": _re.compile(r"\x1b(?:\[[0-?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[ -/]*[0-~])"),
+    "non_ascii": _re.compile(r"[^\x00-\x7F]"),
+    "sgr": _re.compile(r"\x1b\[[0-9;]*m"),
+    "rgb_seq": _re.compile(r"\x1b\[(38|48);2;(\d+);(\d+);(\d+)m"),
+    "ws": _re.compile(r"[^\S\n]*"),
+    "paren": _re.compile(r"[^\S\n]*[/\\]?[^\S\n]*\("),
+    "auto_reset_open": _re.compile(r"\][^\S\n]*[/\\]?[^\S\n]*\("),
+    "flat_format": _re.compile(r"\[[^\S\n]*([^\[\]\"'\n]*)\](?:[^\S\n]*([/\\]?)[^\S\n]*\([^\S\n]*([^()\"'\n]*)(\))?)?"),
+    '"': _re.compile(r'"(?:\\.|[^"\\\n])*"'),
+    "'": _re.compile(r"'(?:\\.|[^'\\\n])*'"),
+    "runs": [_re.compile(r"[^\[\]\"'\n]*")] * 2 + [_re.compile(r"[^()\"'\n]*"), _re.compile(r"[^()\[\"'\n]*")],
     "bg?_default": _re.compile(r"(?i)((?:" + PREFIX_RX["BG"] + r")?)\s*default"),
     "bg_default": _re.compile(r"(?i)" + PREFIX_RX["BG"] + r"\s*default"),
     "modifier": _re.compile(
@@ -123,25 +185,485 @@ COMPILED = {  # PRECOMPILE REGULAR EXPRESSIONS
     ),
     "hex": _re.compile(r"(?i)^\s*(" + PREFIX_RX["BG"] + r")?\s*(?:#|0x)?([0-9A-F]{6}|[0-9A-F]{3})\s*$"),
 }
+SGR_KEYS = {  # REVERSE INDEX: THE SHORTEST FORMAT KEY OF EACH SGR CODE, WHICH CAN'T BE MISTAKEN FOR A MODIFIER
+    code: min(
+        (
+            key
+            for keys, key_code in ANSI.codes_map.items()
+            if key_code == code
+            for key in (keys if isinstance(keys, tuple) else (keys,))
+            if not COMPILED["modifier"].match(key)
+        ),
+        key=len,
+    )
+    for code in ANSI.codes_map.values()
+}
+SGR_ATTRS = (  # THE ATTRIBUTES OF THE TERMINAL STATE, WITH THE SGR CODE WHICH RESETS EACH OF THEM
+    ("bold", 22),
+    ("dim", 22),
+    ("italic", 23),
+    ("underline", 24),
+    ("inverse", 27),
+    ("hidden", 28),
+    ("strikethrough", 29),
+    ("color", 39),
+    ("background", 49),
+)
+SGR_SET = {1: "bold", 2: "dim", 3: "italic", 4: "underline", 21: "underline", 7: "inverse", 8: "hidden", 9: "strikethrough"}
+SGR_SET.update({code: "color" for code in (*range(30, 38), *range(90, 98))})
+SGR_SET.update({code: "background" for code in (*range(40, 48), *range(100, 108))})
+
+
+class _FormatParser:
+    """The bracket matching of `FormatCodes.__find_formats()` for one string, which memoizes
+    at which positions a bracket pair, starting at a certain position, can end."""
+
+    __slots__ = ("string", "length", "memo")
+    ws, runs, closing = COMPILED["ws"].match, COMPILED["runs"], "]])))"
+
+    def __init__(self, string: str):
+        self.string, self.length, self.memo = string, len(string), {}
+
+    def star(self, pos: int, ctx: int) -> list[int]:
+        """Gets the positions of the closing bracket, which the body of a bracket pair, starting at `pos`, can end at
+        (in order of preference). The context `ctx` is the kind of bracket pair the body is inside of:
+        - `0` the formats `[…]`, which can contain `[…]` without auto-reset text
+        - `1` brackets `[…]` nested inside the formats, which can contain formats with auto-reset text
+        - `2` the auto-reset text `(…)`, which can contain `(…)`
+        - `3` brackets `(…)` nested inside the auto-reset text, which can contain formats with auto-reset text"""
+        if (ctx, pos) in self.memo:
+            return self.memo[(ctx, pos)]
+        string, start, run, closing = self.string, pos, self.runs[ctx].match, self.closing[ctx]
+        while True:
+            pos = run(string, pos).end()
+            char = string[pos] if pos < self.length else "\n"
+            if char == closing:
+                result = [pos]
+                break
+            elif char in "\"'":
+                if not (quote := COMPILED[char].match(string, pos)):
+                    result = []
+                    break
+                pos = quote.end()
+            elif (ends := self.nested_ends(char, pos, ctx)) is None:
+                result = []
+                break
+            elif len(ends) == 1:
+                pos = ends[0]
+            else:
+                result = list(dict.fromkeys(e for end in ends for e in self.star(end, ctx)))
+                break
+        self.memo[(ctx, start)] = result
+        return result
+
+    def nested_ends(self, char: str, pos: int, ctx: int) -> list[int] | None:
+        """Gets the end positions of the bracket pair (or format), which opens with `char` at `pos` inside
+        of the context `ctx` (see `star()`), or `None` if the `char` isn't allowed there."""
+        if char == "[" and ctx == 0:
+            return [end + 1 for end in self.star(pos + 1, 1)]
+        elif char == "[" and ctx == 1:
+            return self.format_ends(pos)
+        elif char == "(" and ctx == 2:
+            return [end + 1 for end in self.star(pos + 1, 3)]
+        elif char == "[" and ctx == 3:  # FIRST TRY AS NORMAL CHARACTER, THEN AS FORMAT
+            return [pos + 1] + self.format_ends(pos)
+        return None
+
+    def auto_reset_start(self, pos: int) -> tuple[str, int] | None:
+        """Gets the escape char and the start of the auto-reset text, if an auto-reset text follows at `pos`."""
+        string, length, ws = self.string, self.length, self.ws
+        escape, pos = "", ws(string, pos).end()
+        if pos < length and string[pos] in "/\\":
+            escape, pos = string[pos], ws(string, pos + 1).end()
+        return (escape, ws(string, pos + 1).end()) if pos < length and string[pos] == "(" else None
+
+    def auto_reset(self, pos: int) -> tuple[str | None, str | None, int]:
+        """Gets the escape char, the auto-reset text and the end of the whole formatting code, which
+        has its formats end right before `pos` (escape char and text are `None` without auto-reset text)."""
+        if (auto_reset := self.auto_reset_start(pos)) and (ends := self.star(auto_reset[1], 2)):
+            return auto_reset[0], self.string[auto_reset[1] : ends[0]], ends[0] + 1
+        return None, None, pos
+
+    def format_ends(self, pos: int) -> list[int]:
+        """Gets the end positions of a complete format (with optional auto-reset text) starting at `pos`."""
+        if ("f", pos) not in self.memo:
+            ends = []
+            for end in self.star(self.ws(self.string, pos + 1).end(), 0):
+                if auto_reset := self.auto_reset_start(end + 1):
+                    ends.extend(e + 1 for e in self.star(auto_reset[1], 2))
+                ends.append(end + 1)
+            self.memo[("f", pos)] = list(dict.fromkeys(ends))
+        return self.memo[("f", pos)]
 
 
 class FormatCodes:
 
+    class Template:
+        """A special format-codes template, which is converted to ANSI only once and can then be rendered
+        with different values over and over again, without parsing any format codes while rendering.\n
+        ------------------------------------------------------------------------------------------------------
+        The template can contain replacement fields just like `str.format()` (e.g. `{title}`, `{0}`, `{}`
+        or `{value:>10}`). The values are inserted as plain text, so format codes inside of the values are
+        not interpreted. If a replacement field is placed inside of a format code (e.g. `[{color}]`) or
+        between a format code and an auto-reset text (e.g. `[b]{space}(text)`), the template can't be
+        pre-converted and will be converted with `FormatCodes.to_ansi()` on every render instead. The same
+        happens for a single render, if a value inside an auto-reset text (e.g. `[b]({value})`) would change
+        where the auto-reset text ends (e.g. because it contains parentheses or quotes)."""
+
+        def __init__(self, template: str, default_color: hexa | rgba = None, brightness_steps: int = 20):
+            self.template = template
+            self.default_color = default_color
+            self.brightness_steps = brightness_steps
+            literals, fields, depths, depth = [""], [], [], 0
+            for literal, name, spec, conv in _string.Formatter().parse(template):
+                for char in literal:
+                    depth = depth + 1 if char == "[" else max(0, depth - 1) if char == "]" else depth
+                literals[-1] += literal
+                if name is not None:
+                    literals.append("")
+                    fields.append((name, conv, spec))
+                    depths.append(depth)
+            named, numbered = self.__number(fields, positional=False), self.__number(fields, positional=True)
+            self._named, self._positional = self.__join(literals, named), self.__join(literals, numbered)
+            self.is_static, self._format, self._render = False, self._named, self._positional
+            self._named_guards = self._positional_guards = ()
+            sentinels = list(_islice((c for c in map(chr, range(0xE000, 0xF900)) if c not in template), len(fields)))
+            if any(depths) or len(sentinels) < len(fields):  # A FIELD IS (OR MIGHT BE) PART OF A FORMAT CODE
+                return
+            marked = "".join(lit + sentinel for lit, sentinel in zip(literals, sentinels + [""]))
+            between = rf"[\s/\\{''.join(sentinels)}]*"
+            if sentinels and _re.search(rf"\]{between}[{''.join(sentinels)}]{between}\(", marked):
+                return  # A FIELD BETWEEN A FORMAT CODE AND A `(` DECIDES, IF IT'S AN AUTO-RESET TEXT OR NOT
+            # THE VALUES OF FIELDS INSIDE AN AUTO-RESET TEXT CAN CHANGE WHERE IT ENDS, SO THEY'RE CHECKED ON EVERY RENDER
+            guarded = [
+                i
+                for i, sentinel in enumerate(sentinels)
+                if self.__in_auto_reset(marked[marked.rfind("\n", 0, marked.index(sentinel)) + 1 : marked.index(sentinel)])
+            ]
+            self._named_guards = tuple(self.__join(["", ""], [named[i]]) for i in guarded)
+            self._positional_guards = tuple(self.__join(["", ""], [numbered[i]]) for i in guarded)
+            ansi = FormatCodes.to_ansi(marked, default_color, brightness_steps)
+            parts = _re.split("|".join(sentinels), ansi) if sentinels else [ansi]
+            if len(parts) == len(literals):
+                self.is_static = True
+                self._format, self._render = self.__join(parts, named), self.__join(parts, numbered)
+
+        @staticmethod
+        def __in_auto_reset(line: str) -> bool:
+            """Whether a field at the end of the `line` is (or might be) inside of an auto-reset text `(…)`."""
+            for opener in COMPILED["auto_reset_open"].finditer(line):
+                depth = 1
+                for char in line[opener.end() :]:
+                    if char in "\"'":  # PARENTHESES INSIDE OF QUOTES DON'T COUNT, SO DON'T TRY TO FIND OUT
+                        return True
+                    depth += (char == "(") - (char == ")")
+                    if depth == 0:
+                        break
+                else:
+                    return True
+            return False
+
+        @staticmethod
+        def __number(fields: list[tuple[str, str, str]], positional: bool) -> list[tuple[str, str, str]]:
+            """Give all automatically numbered fields (also the ones nested inside of format specs) an explicit number,
+            or (if `positional`) number all fields in the order they appear in, so each can be formatted on its own."""
+            count, numbered = 0, []
+            for name, conv, spec in fields:
+                if positional or not name:
+                    name, count = str(count), count + 1
+                nested = ""
+                for literal, inner, inner_spec, inner_conv in _string.Formatter().parse(spec or ""):
+                    nested += literal.replace("{", "{{").replace("}", "}}")
+                    if inner is not None:
+                        if positional or not inner:
+                            inner, count = str(count), count + 1
+                        nested += (
+                            "{"
+                            + inner
+                            + (f"!{inner_conv}" if inner_conv else "")
+                            + (f":{inner_spec}" if inner_spec else "")
+                            + "}"
+                        )
+                numbered.append((name, conv, nested))
+            return numbered
+
+        @staticmethod
+        def __join(parts: list[str], fields: list[tuple[str, str, str]]) -> str:
+            """Join the literal `parts` and the replacement `fields` back together to a `str.format()` string."""
+            return parts[0].replace("{", "{{").replace("}", "}}") + "".join(
+                "{"
+                + name
+                + (f"!{conv}" if conv else "")
+                + (f":{spec}" if spec else "")
+                + "}"
+                + part.replace("{", "{{").replace("}", "}}")
+                for (name, conv, spec), part in zip(fields, parts[1:])
+            )
+
+        def __repr__(self):
+            return f"FormatCodes.Template({self.template!r})"
+
+        def format(self, *args: object, **kwargs: object) -> str:
+            """Render the template, filling the replacement fields just like `str.format()` would."""
+            if self.is_static and not (
+                self._named_guards and self.__changes_parsing(guard.format(*args, **kwargs) for guard in self._named_guards)
+            ):
+                return self._format.format(*args, **kwargs)
+            return FormatCodes.to_ansi(self._named.format(*args, **kwargs), self.default_color, self.brightness_steps)
+
+        def render(self, *values: object) -> str:
+            """Render the template, filling the replacement fields with the `values` in the order they appear in."""
+            if self.is_static and not (
+                self._positional_guards and self.__changes_parsing(guard.format(*values) for guard in self._positional_guards)
+            ):
+                return self._render.format(*values)
+            return FormatCodes.to_ansi(self._positional.format(*values), self.default_color, self.brightness_steps)
+
+        @staticmethod
+        def __changes_parsing(values: Iterable[str]) -> bool:
+            """Whether one of the values (of fields inside an auto-reset text) can change where the auto-reset text ends:
+            when it's empty, starts or ends with whitespace (which is skipped there) or contains a `TEMPLATE_GUARD_CHARS`."""
+            return any(
+                not value or value[0].isspace() or value[-1].isspace() or not TEMPLATE_GUARD_CHARS.isdisjoint(value)
+                for value in values
+            )
+
+    class Stream:
+        """A file-like object, which converts the special formatting codes inside everything written to it
+        to ANSI codes and writes the result to `file` (`sys.stdout` by default).\n
+        ------------------------------------------------------------------------------------------------------
+        The text can be written in chunks of any size, even if a format code is split between two chunks.
+        Only the current (not yet complete) line is kept in memory until it can be converted, so the
+        converted output is exactly the same as if the whole text was converted with `FormatCodes.to_ansi()`.
+        Call `close()` (or use the stream as a context manager) to write the rest of the text at the end."""
+
+        def __init__(
+            self,
+            file: IO[str] = None,
+            default_color: hexa | rgba = None,
+            brightness_steps: int = 20,
+            color_depth: str = "truecolor",
+        ):
+            self.file = _sys.stdout if file is None else file
+            if Color.is_valid_rgba(default_color, False):
+                self.default_color = default_color
+            elif Color.is_valid_hexa(default_color, False):
+                self.default_color = Color.to_rgba(default_color)
+            else:
+                self.default_color = None
+            self.brightness_steps = brightness_steps
+            self.color_depth = color_depth
+            self.closed = False
+            self._pending, self._started = "", False
+
+        def __enter__(self) -> "FormatCodes.Stream":
+            return self
+
+        def __exit__(self, *_) -> None:
+            self.close()
+
+        def __repr__(self):
+            return f"FormatCodes.Stream({self.file!r})"
+
+        def convert(self, string: str) -> str:
+            """Convert the next chunk of text and return the ANSI text, which is already complete."""
+            text, self._pending = self._pending + string, ""
+            end = text.rfind("\n") + 1
+            while self.default_color and end and (start := text.rfind("[", 0, end)) != -1:
+                if text.find("]", start, end) != -1 or text.find("_", start, end) != -1:
+                    break
+                end = text.rfind("\n", 0, start) + 1  # A `*` INSIDE THE OPEN FORMAT CODE WOULD BE REPLACED ACROSS LINES
+            if (raw_end := text.find("[", end)) == -1:
+                raw_end = len(text)
+            self._pending = text[raw_end:]
+            return self.__start() + (self.__to_ansi(text[:end]) if end else "") + text[end:raw_end]
+
+        def finish(self) -> str:
+            """Convert the rest of the text and return it as ANSI text."""
+            text, self._pending = self._pending, ""
+            return self.__start() + (self.__to_ansi(text) if text else "")
+
+        def write(self, string: str) -> int:
+            """Convert and write the next chunk of text."""
+            if self.closed:
+                raise ValueError("I/O operation on closed FormatCodes.Stream")
+            if ansi := self.convert(string):
+                self.file.write(ansi)
+            return len(string)
+
+        def writelines(self, lines: Iterable[str]) -> None:
+            for line in lines:
+                self.write(line)
+
+        def flush(self) -> None:
+            """Flush the target file (the current incomplete line is only written at the end of the line)."""
+            self.file.flush()
+
+        def close(self) -> None:
+            """Write the rest of the text and flush the target file (the target file itself is not closed)."""
+            if not self.closed:
+                if ansi := self.finish():
+                    self.file.write(ansi)
+                self.file.flush()
+                self.closed = True
+
+        def __start(self) -> str:
+            if self._started:
+                return ""
+            self._started = True
+            return FormatCodes.to_ansi("", self.default_color, self.brightness_steps, self.color_depth, _validated=True)
+
+        def __to_ansi(self, string: str) -> str:
+            return FormatCodes.to_ansi(
+                string, self.default_color, self.brightness_steps, self.color_depth, _default_start=False, _validated=True
+            )
+
+    class Buffer:
+        """An in-memory output buffer, which collects everything printed with `FormatCodes.print()`
+        (and therefore also `Console.log()` and co.) while it is active and writes it to `file`
+        (`sys.stdout` by default) in batches instead of flushing every single print.\n
+        ----------------------------------------------------------------------------------------------
+        The collected output is flushed as soon as it reaches `max_bytes` characters or the oldest
+        collected output is older than `max_delay` seconds (a background timer also flushes a buffer,
+        which isn't written to any more), when the buffer is deactivated, at exit and on an explicit
+        `flush()`. Everything that writes to the console directly (`FormatCodes.input()`, `Console.cls()`,
+        `Console.pause_exit()`, `Console.confirm()`, ...) flushes the active buffer first, so the output
+        is exactly the same as without a buffer, only the moments it is written at change.\n
+        ----------------------------------------------------------------------------------------------
+        There is only one active buffer for the whole process: a buffer activated in one thread also
+        collects the prints of all the other threads (writing to it is thread-safe). Buffers can be
+        nested, as long as they are deactivated in the reverse order they were activated in."""
+
+        active: "FormatCodes.Buffer" = None
+        timer: type[_threading.Timer] = _threading.Timer  # STARTS THE BACKGROUND FLUSH `timer(max_delay, flush)` OF A BUFFER
+
+        def __init__(self, max_bytes: int = 65536, max_delay: float = 0.1, file: IO[str] = None):
+            self.file = _sys.stdout if file is None else file
+            self.max_bytes = max_bytes
+            self.max_delay = max_delay
+            self._parts, self._size, self._since, self._previous = [], 0, None, None
+            self._lock, self._timer = _threading.RLock(), None
+
+        def __enter__(self) -> "FormatCodes.Buffer":
+            self._previous, FormatCodes.Buffer.active = FormatCodes.Buffer.active, self
+            _atexit.register(self.flush)
+            return self
+
+        def __exit__(self, *_) -> None:
+            FormatCodes.Buffer.active = self._previous
+            _atexit.unregister(self.flush)
+            self.flush()
+
+        def __repr__(self):
+            return f"FormatCodes.Buffer(max_bytes={self.max_bytes!r}, max_delay={self.max_delay!r})"
+
+        def write(self, string: str) -> int:
+            """Add the string to the buffer and flush it if one of the thresholds is reached."""
+            with self._lock:
+                if self._since is None:
+                    self._since = _time.monotonic()
+                    if self.max_delay > 0:
+                        self._timer = self.timer(self.max_delay, self.flush)
+                        self._timer.daemon = True
+                        self._timer.start()
+                self._parts.append(string)
+                self._size += len(string)
+                if self._size >= self.max_bytes or _time.monotonic() - self._since >= self.max_delay:
+                    self.flush()
+            return len(string)
+
+        def flush(self) -> None:
+            """Write all the collected output to the target file and flush it."""
+            with self._lock:
+                if self._timer is not None:
+                    self._timer.cancel()
+                    self._timer = None
+                if self._parts:
+                    output, self._parts, self._size, self._since = "".join(self._parts), [], 0, None
+                    self.file.write(output)
+                    self.file.flush()
+
+        @staticmethod
+        def flush_active() -> None:
+            """Flush the currently active buffer (if there is one), before writing to the console directly."""
+            if FormatCodes.Buffer.active:
+                FormatCodes.Buffer.active.flush()
+
+    class Theme:
+        """A prepared set of formatting options, with which strings can be converted and printed over
+        and over again, without validating and converting the `default_color` on every call:
+        ```python
+        theme = FormatCodes.Theme(default_color="#A5D6FF", brightness_steps=20)
+        for line in log_lines:
+            theme.print(f"[b](INFO:) {line} [*]")
+        ```"""
+
+        def __init__(
+            self,
+            default_color: hexa | rgba = None,
+            brightness_steps: int = 20,
+            color_depth: str = "truecolor",
+            optimize: bool = False,
+        ):
+            if Color.is_valid_rgba(default_color, False):
+                self.default_color = default_color
+            elif Color.is_valid_hexa(default_color, False):
+                self.default_color = Color.to_rgba(default_color)
+            else:
+                self.default_color = None
+            self.brightness_steps, self.optimize = brightness_steps, optimize
+            terminal = FormatCodes.terminal_support()  # ALSO CONFIGURES THE CONSOLE ONCE, BEFORE ANYTHING IS PRINTED
+            self.color_depth = terminal["color_depth"] if color_depth == "auto" else color_depth
+            if self.color_depth not in COLOR_DEPTHS:
+                raise ValueError(f"Invalid color depth '{color_depth}': expected one of {', '.join(map(repr, COLOR_DEPTHS))}")
+
+        def __repr__(self):
+            return f"FormatCodes.Theme(default_color={self.default_color!r}, brightness_steps={self.brightness_steps!r})"
+
+        def to_ansi(self, string: str) -> str:
+            """Convert the special formatting codes inside a string to printable ANSI codes."""
+            return FormatCodes.to_ansi(
+                string, self.default_color, self.brightness_steps, self.color_depth, optimize=self.optimize, _validated=True
+            )
+
+        def print(self, *values: object, sep: str = " ", end: str = "\n", flush: bool = True) -> None:
+            """Print a string that can be formatted using special formatting codes."""
+            ansi = self.to_ansi(sep.join(map(str, values)) + end)
+            if FormatCodes.Buffer.active:
+                FormatCodes.Buffer.active.write(ansi)
+                return
+            _sys.stdout.write(ansi)
+            if flush:
+                _sys.stdout.flush()
+
     @staticmethod
     def print(
         *values: object,
         default_color: hexa | rgba = None,
         brightness_steps: int = 20,
+        color_depth: str = "truecolor",
+        optimize: bool = False,
         sep: str = " ",
         end: str = "\n",
         flush: bool = True,
     ) -> None:
         """Print a string that can be formatted using special formatting codes.\n
         --------------------------------------------------------------------------
+        With `color_depth` you can print for terminals with less colors (`"256"`
+        or `"16"`), without any ANSI codes (`"none"`) or let the terminal decide
+        (`"auto"`). With `optimize` all redundant ANSI codes are left out.
+        For more information see `FormatCodes.to_ansi()`.\n
+        --------------------------------------------------------------------------
         For exact information about how to use special formatting codes, see the
         `xx_format_codes` module documentation."""
-        FormatCodes.__config_console()
-        _sys.stdout.write(FormatCodes.to_ansi(sep.join(map(str, values)) + end, default_color, brightness_steps))
+        FormatCodes.__detect_terminal()
+        ansi = FormatCodes.to_ansi(
+            sep.join(map(str, values)) + end, default_color, brightness_steps, color_depth, optimize=optimize
+        )
+        if FormatCodes.Buffer.active:
+            FormatCodes.Buffer.active.write(ansi)
+            return
+        _sys.stdout.write(ansi)
         if flush:
             _sys.stdout.flush()
 
@@ -150,77 +672,92 @@ class FormatCodes:
         prompt: object = "",
         default_color: hexa | rgba = None,
         brightness_steps: int = 20,
+        color_depth: str = "truecolor",
     ) -> str:
         """An input, which's prompt can be formatted using special formatting codes.\n
         -------------------------------------------------------------------------------
         For exact information about how to use special formatting codes, see the
         `xx_format_codes` module documentation."""
-        FormatCodes.__config_console()
-        return input(FormatCodes.to_ansi(prompt, default_color, brightness_steps))
+        FormatCodes.__detect_terminal()
+        FormatCodes.Buffer.flush_active()
+        return input(FormatCodes.to_ansi(prompt, default_color, brightness_steps, color_depth))
+
+    @staticmethod
+    def buffered(max_bytes: int = 65536, max_delay: float = 0.1, file: IO[str] = None) -> "FormatCodes.Buffer":
+        """Collect all the output of `FormatCodes.print()` inside a `with` block and write it in batches:
+        ```python
+        with FormatCodes.buffered(max_bytes=65536, max_delay=0.1):
+            for i in range(100_000):
+                Console.log("INFO", f"line [b]({i})")
+        ```
+        The output is written as soon as it reaches `max_bytes` characters or is older than
+        `max_delay` seconds, at the end of the `with` block, at exit and on `flush()`.
+        `FormatCodes.input()` and the interactive `Console` functions also flush the output
+        before they write to the console directly or ask for input."""
+        return FormatCodes.Buffer(max_bytes, max_delay, file)
 
     @staticmethod
     def to_ansi(
-        string: str, default_color: hexa | rgba = None, brightness_steps: int = 20, _default_start: bool = True
+        string: str,
+        default_color: hexa | rgba = None,
+        brightness_steps: int = 20,
+        color_depth: str = "truecolor",
+        engine: str = "fast",
+        optimize: bool = False,
+        _default_start: bool = True,
+        _validated: bool = False,
     ) -> str:
         """Convert the special formatting codes inside a string to printable ANSI codes.\n
         -----------------------------------------------------------------------------------
+        The `color_depth` decides which colors the ANSI codes use:
+        - `"truecolor"` =⠀RGB colors (`38;2;r;g;b`), exactly as specified
+        - `"256"` =⠀the nearest of the xterm 256 colors (`38;5;n`)
+        - `"16"` =⠀the nearest of the 16 standard console colors (`30`-`37` and `90`-`97`)
+        - `"none"` =⠀no ANSI codes at all, the formatting codes are just removed
+        - `"auto"` =⠀the color depth the terminal supports (see `FormatCodes.terminal_support()`)\n
+        -----------------------------------------------------------------------------------
+        The `engine`, which finds the formatting codes, can be set to:
+        - `"fast"` =⠀a single-pass parser, which handles the whole string at once
+        - `"regex"` =⠀the recursive `COMPILED["format"]` regex, applied to each line\n
+        Both engines produce exactly the same result.\n
+        -----------------------------------------------------------------------------------
+        With `optimize`, all SGR sequences which don't change the look of the text are
+        removed and adjacent ones are merged (see `FormatCodes.optimize_ansi()`).\n
+        -----------------------------------------------------------------------------------
         For exact information about how to use special formatting codes, see the
         `xx_format_codes` module documentation."""
-        if Color.is_valid_rgba(default_color, False):
-            use_default = True
-        elif Color.is_valid_hexa(default_color, False):
-            use_default, default_color = True, Color.to_rgba(default_color)
-        else:
-            use_default = False
-        if use_default:
+        color_depth = FormatCodes.__check_options(engine, color_depth)
+        if not _validated:
+            default_color = FormatCodes.__validate_default_color(default_color)
+        if (use_default := default_color is not None) and "*" in string:
             string = COMPILED["*"].sub(r"[\1_|default\2]", string)  # REPLACE `[…|*|…]` WITH `[…|_|default|…]`
             string = COMPILED["*color"].sub(r"[\1default\2]", string)  # REPLACE `[…|*color|…]` WITH `[…|default|…]`
 
-        def is_valid_color(color: str) -> bool:
-            return color in ANSI.color_map or Color.is_valid_rgba(color) or Color.is_valid_hexa(color)
+        if remove_codes := color_depth == "none":  # BUILD THE SAME REPLACEMENTS AND REMOVE THE CODES FROM THEM AFTERWARDS
+            color_depth = "truecolor"
 
-        def replace_keys(match: _re.Match) -> str:
-            formats = match.group(1)
-            escaped = match.group(2)
-            auto_reset_txt = match.group(3)
+        def replace_keys(match: str, formats: str, escaped: str | None, auto_reset_txt: str | None) -> str:
             if auto_reset_txt and auto_reset_txt.count("[") > 0 and auto_reset_txt.count("]") > 0:
-                auto_reset_txt = FormatCodes.to_ansi(auto_reset_txt, default_color, brightness_steps, False)
+                auto_reset_txt = FormatCodes.to_ansi(
+                    auto_reset_txt, default_color, brightness_steps, color_depth, engine, False, False, True
+                )
             if not formats:
-                return match.group(0)
+                return match
             if formats.count("[") > 0 and formats.count("]") > 0:
-                formats = FormatCodes.to_ansi(formats, default_color, brightness_steps, False)
+                formats = FormatCodes.to_ansi(
+                    formats, default_color, brightness_steps, color_depth, engine, False, False, True
+                )
             format_keys = [k.strip() for k in formats.split("|") if k.strip()]
             ansi_formats = [
-                r if (r := FormatCodes.__get_replacement(k, default_color, brightness_steps)) != k else f"[{k}]"
+                r if (r := FormatCodes.__get_replacement(k, default_color, brightness_steps, color_depth)) != k else f"[{k}]"
                 for k in format_keys
             ]
             if auto_reset_txt and not escaped:
-                reset_keys = []
-                for k in format_keys:
-                    k_lower = k.lower()
-                    k_set = set(k_lower.split(":"))
-                    if PREFIX["BG"] & k_set and len(k_set) <= 3:
-                        if k_set & PREFIX["BR"]:
-                            for i in range(len(k)):
-                                if is_valid_color(k[i:]):
-                                    reset_keys.extend(["_bg", "_color"])
-                                    break
-                        else:
-                            for i in range(len(k)):
-                                if is_valid_color(k[i:]):
-                                    reset_keys.append("_bg")
-                                    break
-                    elif is_valid_color(k) or any(
-                        k_lower.startswith(pref_colon := f"{prefix}:") and is_valid_color(k[len(pref_colon) :])
-                        for prefix in PREFIX["BR"]
-                    ):
-                        reset_keys.append("_color")
-                    else:
-                        reset_keys.append(f"_{k}")
+                reset_keys = [r for k in format_keys for r in FormatCodes.__get_reset_keys(k)]
                 ansi_resets = [
                     r
                     for k in reset_keys
-                    if (r := FormatCodes.__get_replacement(k, default_color, brightness_steps)).startswith(
+                    if (r := FormatCodes.__get_replacement(k, default_color, brightness_steps, color_depth)).startswith(
                         f"{ANSI.char}{ANSI.start}"
                     )
                 ]
@@ -229,19 +766,288 @@ class FormatCodes:
             if not (len(ansi_formats) == 1 and ansi_formats[0].count(f"{ANSI.char}{ANSI.start}") >= 1) and not all(
                 f.startswith(f"{ANSI.char}{ANSI.start}") for f in ansi_formats
             ):
-                return match.group(0)
-            return (
+                return match
+            replacement = (
                 "".join(ansi_formats)
                 + (
-                    f"({FormatCodes.to_ansi(auto_reset_txt, default_color, brightness_steps, False)})"
+                    f"({FormatCodes.to_ansi(auto_reset_txt, default_color, brightness_steps, color_depth, engine, False, False, True)})"
                     if escaped and auto_reset_txt
                     else auto_reset_txt if auto_reset_txt else ""
                 )
                 + ("" if escaped else "".join(ansi_resets))
             )
+            return COMPILED["sgr"].sub("", replacement) if remove_codes else replacement
+
+        string = FormatCodes.__replace_formats(string, replace_keys, engine)
+        if use_default and _default_start and not remove_codes:
+            string = FormatCodes.__downsample(FormatCodes.__get_default_ansi(default_color), color_depth) + string
+        return FormatCodes.optimize_ansi(string) if optimize and not remove_codes else string
 
-        string = "\n".join(COMPILED["format"].sub(replace_keys, line) for line in string.split("\n"))
-        return (FormatCodes.__get_default_ansi(default_color) if _default_start else "") + string if use_default else string
+    @staticmethod
+    def __check_options(engine: str, color_depth: str) -> str:
+        """Checks the `engine` and `color_depth` options of `FormatCodes.to_ansi()` and returns
+        the color depth to use (the one the terminal supports, if `color_depth` is `"auto"`)."""
+        if engine not in ("fast", "regex"):
+            raise ValueError(f"Invalid engine '{engine}': expected 'fast' or 'regex'")
+        if color_depth == "auto":
+            return FormatCodes.__detect_terminal()["color_depth"]
+        elif color_depth not in COLOR_DEPTHS:
+            raise ValueError(f"Invalid color depth '{color_depth}': expected one of {', '.join(map(repr, COLOR_DEPTHS))}")
+        return color_depth
+
+    @staticmethod
+    def __replace_formats(string: str, replace_keys: callable, engine: str) -> str:
+        """Replaces all formatting codes inside the string with what `replace_keys(match, formats, escaped, auto_reset_txt)`
+        returns for them, finding them with the given `engine` (see `FormatCodes.to_ansi()`)."""
+        if engine == "fast":
+            try:
+                result, last, replaced = [], 0, {}  # SAME FORMATTING CODES ARE ONLY REPLACED ONCE PER STRING
+                for start, end, *parts in FormatCodes.__find_formats(string):
+                    if (key := (string[start:end], *parts)) not in replaced:
+                        replaced[key] = replace_keys(*key)
+                    result.extend((string[last:start], replaced[key]))
+                    last = end
+                return "".join(result) + string[last:] if result else string
+            except RecursionError:  # NESTED TOO DEEP FOR THE PARSER, SO LET THE REGEX ENGINE HANDLE IT
+                pass
+        return "\n".join(
+            COMPILED["format"].sub(lambda m: replace_keys(m.group(0), *m.groups()), line) for line in string.split("\n")
+        )
+
+    @staticmethod
+    def compile(template: str, default_color: hexa | rgba = None, brightness_steps: int = 20) -> "FormatCodes.Template":
+        """Convert the special formatting codes inside a template string to ANSI codes only once.\n
+        ----------------------------------------------------------------------------------------------
+        The returned `FormatCodes.Template` can then be rendered with `.format(**kwargs)` or
+        `.render(*values)` as often as you want, which costs about as much as a simple `str.format()`.
+        The rendered string is the same as `FormatCodes.to_ansi(template.format(**kwargs))` would be,
+        as long as the inserted values don't contain format codes themselves.\n
+        ----------------------------------------------------------------------------------------------
+        For exact information about how to use special formatting codes, see the
+        `xx_format_codes` module documentation."""
+        return FormatCodes.Template(template, default_color, brightness_steps)
+
+    @staticmethod
+    def iter_ansi(
+        chunks: Iterable[str] | IO[str] | str,
+        default_color: hexa | rgba = None,
+        brightness_steps: int = 20,
+        color_depth: str = "truecolor",
+        chunk_size: int = 65536,
+    ) -> Iterator[str]:
+        """Convert the special formatting codes inside a text, which is given in chunks, to ANSI codes
+        and yield the converted text chunk by chunk.\n
+        -----------------------------------------------------------------------------------------------
+        `chunks` can be any iterable of strings (e.g. a generator or the lines of a file) or a readable
+        file-like object, which will be read in blocks of `chunk_size` characters. Only the current
+        line is kept in memory, so even huge texts can be converted in constant memory.\n
+        -----------------------------------------------------------------------------------------------
+        For exact information about how to use special formatting codes, see the
+        `xx_format_codes` module documentation."""
+        stream = FormatCodes.Stream(None, default_color, brightness_steps, color_depth)
+        if isinstance(chunks, str):
+            chunks = (chunks,)
+        elif hasattr(chunks, "read"):
+            read = chunks.read
+            chunks = iter(lambda: read(chunk_size), "")
+        for chunk in chunks:
+            if ansi := stream.convert(chunk):
+                yield ansi
+        if ansi := stream.finish():
+            yield ansi
+
+    @staticmethod
+    def to_ansi_many(
+        strings: Iterable[str],
+        default_color: hexa | rgba = None,
+        brightness_steps: int = 20,
+        color_depth: str = "truecolor",
+        workers: int = None,
+    ) -> list[str]:
+        """Convert the special formatting codes inside many strings to ANSI codes in parallel,
+        using a pool of `workers` processes (the number of CPUs by default).\n
+        ---------------------------------------------------------------------------------------------
+        The result is the same list `[FormatCodes.to_ansi(s, …) for s in strings]` would give.
+        On platforms which start new processes with `spawn` (e.g. Windows), this has to be called
+        from inside an `if __name__ == "__main__":` block.\n
+        ---------------------------------------------------------------------------------------------
+        For exact information about how to use special formatting codes, see the
+        `xx_format_codes` module documentation."""
+        strings = list(strings)
+        if (default_color := FormatCodes.__validate_default_color(default_color)) is not None:
+            default_color = tuple(default_color[:3])  # A PLAIN TUPLE CAN BE SENT TO THE OTHER PROCESSES
+        return FormatCodes.__map_to_ansi(strings, default_color, brightness_steps, color_depth, [True] * len(strings), workers)
+
+    @staticmethod
+    def to_ansi_chunked(
+        string: str,
+        default_color: hexa | rgba = None,
+        brightness_steps: int = 20,
+        color_depth: str = "truecolor",
+        workers: int = None,
+        chunk_size: int = 1 << 20,
+    ) -> str:
+        """Convert the special formatting codes inside a huge (multi-line) string to ANSI codes in
+        parallel, by splitting it into chunks of about `chunk_size` characters at line boundaries and
+        converting them with a pool of `workers` processes (the number of CPUs by default).\n
+        ---------------------------------------------------------------------------------------------
+        The result is exactly the same as `FormatCodes.to_ansi()` would give. On platforms which
+        start new processes with `spawn` (e.g. Windows), this has to be called from inside an
+        `if __name__ == "__main__":` block.\n
+        ---------------------------------------------------------------------------------------------
+        For exact information about how to use special formatting codes, see the
+        `xx_format_codes` module documentation."""
+        if (default_color := FormatCodes.__validate_default_color(default_color)) is not None:
+            default_color = tuple(default_color[:3])  # A PLAIN TUPLE CAN BE SENT TO THE OTHER PROCESSES
+        chunks, start = [], 0
+        while start < len(string):
+            if (end := string.find("\n", start + chunk_size) + 1) == 0:
+                end = len(string)
+            while default_color and end < len(string) and (bracket := string.rfind("[", start, end)) != -1:
+                if string.find("]", bracket, end) != -1 or string.find("_", bracket, end) != -1:
+                    break
+                # A `*` INSIDE THE OPEN FORMAT CODE WOULD BE REPLACED ACROSS LINES, SO CUT BEHIND ITS END
+                ends = [i for i in (string.find("]", end), string.find("_", end)) if i != -1]
+                end = (string.find("\n", min(ends)) + 1 or len(string)) if ends else len(string)
+            chunks.append(string[start:end])
+            start = end
+        starts = [True] + [False] * (len(chunks) - 1)
+        return "".join(
+            FormatCodes.__map_to_ansi(chunks or [""], default_color, brightness_steps, color_depth, starts, workers)
+        )
+
+    @staticmethod
+    def from_ansi(ansi_string: str) -> str:
+        """Convert the SGR sequences (text formats and colors) inside an ANSI string back to the shortest
+        equivalent special formatting codes, so `FormatCodes.to_ansi()` can render it again later (e.g.
+        with another `color_depth`).\n
+        ---------------------------------------------------------------------------------------------------
+        The string is parsed in one pass, which keeps track of the terminal state: directly adjacent
+        sequences are merged into one `[…|…]` code and sequences which don't change the state are dropped.
+        RGB and 256 colors become HEX colors (`[#F08]`) and the 16 standard colors get their names (`[red]`).
+        SGR codes without a formatting code (e.g. blinking) are dropped, other escape sequences are kept.\n
+        ---------------------------------------------------------------------------------------------------
+        A `(` directly behind a code is escaped with `/`, but text which itself looks like a valid
+        formatting code (e.g. a literal `[b]` or `[` directly in front of a code) can't be escaped."""
+        result, last, transitions = [], 0, {}
+        state, target = {attr: "" for attr, _ in SGR_ATTRS}, {attr: "" for attr, _ in SGR_ATTRS}
+        segment = ["", [], 0]  # THE CODE, TEXTS AND START OF THE CURRENT SEGMENT, IN WHICH THE STATE DOESN'T CHANGE
+
+        def flush() -> None:
+            code, text, pos = segment[0], "".join(segment[1]), segment[2]
+            if code and COMPILED["paren"].match(text):  # THE VISIBLE TEXT UNTIL THE END OF THE LINE
+                line = COMPILED["sgr"].sub(
+                    "", ansi_string[pos : (ansi_string.find("\n", pos) + 1 or len(ansi_string) + 1) - 1]
+                )
+            while (
+                code
+                and (paren := COMPILED["paren"].match(text))
+                and COMPILED["format"].match(code + line).group(3) is not None
+            ):
+                # THE `(` WOULD START AN AUTO-RESET TEXT, SO ESCAPE IT AND REPEAT THE CODE BEHIND WHITESPACE, WHICH WOULD BE REMOVED
+                if paren.end() > 1:
+                    result.extend((code, text[: paren.end() - 1]))
+                result.extend((code, "/("))
+                text, line = text[paren.end() :], line[paren.end() :]
+                if not (line[:1].isspace() or line[:1] == ")" or COMPILED["paren"].match(text)):
+                    code = ""
+            result.extend((code, text))
+
+        def add_text(text: str, pos: int) -> None:
+            nonlocal state
+            if target != state:  # THE SAME STATE CHANGES ARE ONLY CONVERTED ONCE PER STRING
+                if (key := (tuple(state.items()), tuple(target.items()))) not in transitions:
+                    transitions[key] = f"[{'|'.join(FormatCodes.__sgr_transition(state, target))}]"
+                flush()
+                segment[:] = transitions[key], [], pos
+                state = dict(target)
+            segment[1].append(text)
+
+        for match in COMPILED["sgr"].finditer(ansi_string):
+            if match.start() > last:
+                add_text(ansi_string[last : match.start()], last)
+            last, params = match.end(), [int(p) if p else 0 for p in match.group(0)[2:-1].split(";")]
+            while params:
+                code = params.pop(0)
+                if code == 0:
+                    target.update((attr, "") for attr, _ in SGR_ATTRS)
+                elif code in SGR_SET:
+                    target[SGR_SET[code]] = SGR_KEYS[code]
+                elif code in SGR_KEYS:  # ONE OF THE SPECIFIC RESETS
+                    target.update((attr, "") for attr, reset_code in SGR_ATTRS if reset_code == code)
+                elif code in (38, 48) and (
+                    (params[:1] == [2] and len(params) >= 4 and max(params[1:4]) < 256)
+                    or (params[:1] == [5] and len(params) >= 2 and params[1] < 256)
+                ):
+                    rgb = tuple(params[1:4]) if params[0] == 2 else XTERM_256[params[1]]
+                    del params[: 4 if params[0] == 2 else 2]
+                    hex_str = "".join(f"{v:02X}" for v in rgb)
+                    if all(v % 17 == 0 for v in rgb):
+                        hex_str = hex_str[::2]
+                    target["color" if code == 38 else "background"] = f"{'' if code == 38 else 'bg:'}#{hex_str}"
+                elif code in (38, 48, 58):  # AN INVALID OR UNSUPPORTED COLOR, WHOSE PARAMETERS CAN'T BE TOLD APART
+                    params = []
+        add_text(ansi_string[last:], last)
+        flush()
+        return "".join(result)
+
+    @staticmethod
+    def optimize_ansi(ansi_string: str) -> str:
+        """Removes the SGR sequences (text formats and colors), which don't change the look of the text,
+        and merges directly adjacent SGR sequences into one, without changing how the string is displayed.\n
+        --------------------------------------------------------------------------------------------------
+        A sequence doesn't change the look, if it sets a format or color, which is already set, or if it's
+        overridden before the next text, so e.g. `ESC[1mESC[1mESC[31mESC[32m` becomes `ESC[1;32m`.
+        What's set in the terminal in front of the string is unknown, so e.g. a first `ESC[0m` is always kept.
+        SGR codes which aren't formats or colors (e.g. blinking) are kept as they are."""
+        if ANSI.char not in ansi_string:
+            return ansi_string
+        result, last, state, target, transitions = [], 0, {}, {}, {}
+        reset, raw = False, True  # A TOTAL RESET HAS TO BE KEPT, IF IT ALSO RESETS SGR CODES WHICH AREN'T TRACKED
+
+        def add_sequence(target: dict[str, str]) -> None:
+            nonlocal state, reset, raw
+            if (key := (tuple(state.items()), tuple(target.items()), (reset or None) if raw else False)) not in transitions:
+                transitions[key] = FormatCodes.__sgr_transition(state, target, False, key[2])
+            if params := transitions[key]:
+                result.append(ANSI.seq(len(params)).format(*params))
+            state, reset, raw = dict(target), False, raw and not reset
+
+        for match in COMPILED["sgr"].finditer(ansi_string):
+            if match.start() > last:
+                add_sequence(target)
+                result.append(ansi_string[last : match.start()])
+            last, params = match.end(), [int(p) if p else 0 for p in match.group(0)[2:-1].split(";")]
+            previous, previous_reset, unknown = dict(target), reset, False
+            while params:
+                code = params.pop(0)
+                if code == 0:
+                    target.update((attr, "") for attr, _ in SGR_ATTRS)
+                    reset = True
+                elif code in SGR_SET:
+                    target[SGR_SET[code]] = str(code)
+                elif code in SGR_KEYS:  # ONE OF THE SPECIFIC RESETS
+                    target.update((attr, "") for attr, reset_code in SGR_ATTRS if reset_code == code)
+                elif code in (38, 48) and (
+                    (params[:1] == [2] and len(params) >= 4 and max(params[1:4]) < 256)
+                    or (params[:1] == [5] and len(params) >= 2 and params[1] < 256)
+                ):
+                    count = 4 if params[0] == 2 else 2
+                    target["color" if code == 38 else "background"] = ";".join(map(str, [code] + params[:count]))
+                    del params[:count]
+                elif code in (38, 48, 58):  # AN INVALID OR UNSUPPORTED COLOR, SO IT'S UNKNOWN HOW THE NEXT CODES ARE READ
+                    unknown, params = True, []
+                    target.clear()
+                else:  # AN SGR CODE WHICH ISN'T TRACKED
+                    unknown = True
+            if unknown:  # SO THE WHOLE SEQUENCE IS KEPT AS IT IS
+                reset = previous_reset
+                add_sequence(previous)
+                result.append(match.group(0))
+                state, raw = dict(target), True
+        add_sequence(target)
+        result.append(ansi_string[last:])
+        return "".join(result)
 
     @staticmethod
     def escape_ansi(ansi_string: str, escaped_char: str = ANSI.char_esc) -> str:
@@ -249,15 +1055,157 @@ class FormatCodes:
         return ansi_string.replace(ANSI.char, escaped_char)
 
     @staticmethod
-    @lru_cache(maxsize=64)
-    def __config_console() -> None:
-        """Configure the console to be able to interpret ANSI formattings."""
+    def get_brightness_ramp(default_color: hexa | rgba, brightness_steps: int = 20) -> dict[int, rgba]:
+        """Get all the lighter and darker versions of `default_color`, which the modifiers
+        `[l]`, `[ll]`, … and `[d]`, `[dd]`, … (or `[+]`, `[++]`, … and `[-]`, `[--]`, …) use.\n
+        -------------------------------------------------------------------------------------------
+        The keys are the number of modifier chars, positive for lighter and negative for darker
+        versions (`0` is `default_color` itself). More modifier chars than the highest key give
+        the same color as the highest key. With `brightness_steps=0` the modifiers don't change
+        the color, so the ramp only contains `default_color` itself. The ramp is only computed
+        once per color and steps."""
+        if Color.is_valid_rgba(default_color, False):
+            default_color = tuple(default_color[:3])
+        elif Color.is_valid_hexa(default_color, False):
+            default_color = tuple(Color.to_rgba(default_color)[:3])
+        else:
+            raise ValueError(f"Invalid default color '{default_color}'")
+        return {
+            adjust: rgba(*color)
+            for adjust, color in FormatCodes.__get_brightness_ramp(default_color, brightness_steps).items()
+        }
+
+    @staticmethod
+    def strip_ansi(ansi_string: str) -> str:
+        """Removes all ANSI escape sequences from the string, so only the visible text remains."""
+        return COMPILED["ansi"].sub("", ansi_string) if ANSI.char in ansi_string else ansi_string
+
+    @staticmethod
+    def remove_formatting(string: str, default_color: hexa | rgba = None, brightness_steps: int = 20) -> str:
+        """Removes all special formatting codes from the string, without adding any ANSI codes.\n
+        -----------------------------------------------------------------------------------------------
+        The result is the visible text of `FormatCodes.to_ansi(string, default_color, brightness_steps)`,
+        so invalid formatting codes stay in the text, just like they would be printed."""
+        return FormatCodes.to_ansi(string, default_color, brightness_steps, "none")
+
+    @staticmethod
+    def visible_len(string: str) -> int:
+        """Get the width, the string takes up in the console, ignoring all ANSI escape sequences.\n
+        ---------------------------------------------------------------------------------------------
+        Wide (East Asian) characters are counted as 2 and combining and zero-width characters as 0.
+        Special formatting codes are counted as normal text, so to get the width of a string with
+        formatting codes, use `FormatCodes.visible_len(FormatCodes.remove_formatting(string))`."""
+        string = FormatCodes.strip_ansi(string)
+        if string.isascii():
+            return len(string)
+        return len(string) + sum(FormatCodes.__char_width(char) - 1 for char in COMPILED["non_ascii"].findall(string))
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def __char_width(char: str) -> int:
+        """Get the width, a single character takes up in the console."""
+        if _unicodedata.combining(char) or _unicodedata.category(char) in ("Mn", "Me", "Cf"):
+            return 0
+        return 2 if _unicodedata.east_asian_width(char) in ("W", "F") else 1
+
+    @staticmethod
+    def terminal_support() -> dict[str, bool | str]:
+        """Get information about what the terminal (`sys.stdout`) supports:
+        - `is_tty` -⠀whether the output goes to a terminal and not e.g. to a file or a pipe
+        - `ansi` -⠀whether the terminal interprets ANSI codes
+        - `color_depth` -⠀the supported colors: `"truecolor"`, `"256"`, `"16"` or `"none"`
+        - `256color` -⠀whether the terminal supports at least 256 colors
+        - `truecolor` -⠀whether the terminal supports RGB colors\n
+        ------------------------------------------------------------------------------------
+        The terminal is only inspected once per process (which on Windows also enables
+        the console's ANSI support) and the result is reused from then on."""
+        return dict(FormatCodes.__detect_terminal())
+
+    @staticmethod
+    @lru_cache(maxsize=1)
+    def __detect_terminal() -> dict[str, bool | str]:
+        """Inspects the terminal once and configures the console to be able to interpret ANSI formattings."""
         _sys.stdout.flush()
-        kernel32 = _ctypes.windll.kernel32
-        h = kernel32.GetStdHandle(-11)
-        mode = _ctypes.c_ulong()
-        kernel32.GetConsoleMode(h, _ctypes.byref(mode))
-        kernel32.SetConsoleMode(h, mode.value | 0x0004)
+        is_tty = hasattr(_sys.stdout, "isatty") and _sys.stdout.isatty()
+        if _os.name == "nt":
+            ansi = FormatCodes.__enable_vt_mode()
+            color_depth = "truecolor" if ansi else "none"
+        else:
+            term, colorterm = _os.environ.get("TERM", "").lower(), _os.environ.get("COLORTERM", "").lower()
+            ansi = is_tty and term not in ("", "dumb")
+            if not ansi:
+                color_depth = "none"
+            elif colorterm in ("truecolor", "24bit"):
+                color_depth = "truecolor"
+            elif "256" in term:
+                color_depth = "256"
+            else:
+                color_depth = "16"
+        if _os.environ.get("NO_COLOR"):
+            color_depth = "none"
+        return {
+            "is_tty": is_tty,
+            "ansi": ansi,
+            "color_depth": color_depth,
+            "256color": color_depth in ("truecolor", "256"),
+            "truecolor": color_depth == "truecolor",
+        }
+
+    @staticmethod
+    def __enable_vt_mode() -> bool:
+        """Enables the virtual terminal processing of the Windows console, so it interprets ANSI codes."""
+        try:
+            kernel32 = _ctypes.windll.kernel32
+            h = kernel32.GetStdHandle(-11)
+            mode = _ctypes.c_ulong()
+            if not kernel32.GetConsoleMode(h, _ctypes.byref(mode)):
+                return False
+            return bool(kernel32.SetConsoleMode(h, mode.value | 0x0004))
+        except (AttributeError, OSError):
+            return False
+
+    @staticmethod
+    def __map_to_ansi(
+        strings: list[str],
+        default_color: tuple,
+        brightness_steps: int,
+        color_depth: str,
+        default_starts: list[bool],
+        workers: int = None,
+    ) -> list[str]:
+        """Converts all the strings with `FormatCodes.to_ansi()`, in a process pool if it's worth it."""
+        workers = min(workers or _os.cpu_count() or 1, len(strings))
+        args = (
+            strings,
+            _repeat(default_color),
+            _repeat(brightness_steps),
+            _repeat(color_depth),
+            _repeat("fast"),
+            _repeat(False),
+            default_starts,
+        )
+        if workers <= 1:
+            return list(map(FormatCodes.to_ansi, *args))
+        with _futures.ProcessPoolExecutor(workers) as executor:
+            return list(executor.map(FormatCodes.to_ansi, *args, chunksize=max(1, len(strings) // (workers * 4))))
+
+    @staticmethod
+    def __validate_default_color(default_color: hexa | rgba) -> hexa | rgba | None:
+        """Get the `default_color` as a valid RGBA color or `None` if it's not a valid color.
+        The results for hashable colors (like HEX strings) are cached."""
+        try:
+            return FormatCodes.__get_valid_default_color(default_color)
+        except TypeError:  # UNHASHABLE COLOR (E.G. `rgba` OR `list`)
+            return FormatCodes.__get_valid_default_color.__wrapped__(default_color)
+
+    @staticmethod
+    @lru_cache(maxsize=64)
+    def __get_valid_default_color(default_color: hexa | rgba) -> hexa | rgba | None:
+        if Color.is_valid_rgba(default_color, False):
+            return default_color
+        elif Color.is_valid_hexa(default_color, False):
+            return Color.to_rgba(default_color)
+        return None
 
     @staticmethod
     def __get_default_ansi(
@@ -271,48 +1219,128 @@ class FormatCodes:
             return (ANSI.seq_bg_color if format_key and COMPILED["bg_default"].search(format_key) else ANSI.seq_color).format(
                 *default_color[:3]
             )
-        if not (format_key in _modifiers[0] or format_key in _modifiers[1]):
-            return None
-        match = COMPILED["modifier"].match(format_key)
-        if not match:
+        if not (format_key and (match := COMPILED["modifier"].match(format_key))):
             return None
         is_bg, modifiers = match.groups()
-        adjust = 0
-        for mod in _modifiers[0] + _modifiers[1]:
-            adjust = String.single_char_repeats(modifiers, mod)
-            if adjust and adjust > 0:
-                modifiers = mod
-                break
-        if adjust == 0:
-            return None
-        elif modifiers in _modifiers[0]:
-            new_rgb = Color.adjust_lightness(default_color, (brightness_steps / 100) * adjust)
-        elif modifiers in _modifiers[1]:
-            new_rgb = Color.adjust_lightness(default_color, -(brightness_steps / 100) * adjust)
+        adjust = len(modifiers) if modifiers[0] in _modifiers[0] else -len(modifiers)
+        ramp = FormatCodes.__get_brightness_ramp(tuple(default_color[:3]), brightness_steps)
+        new_rgb = ramp[max(-(len(ramp) // 2), min(len(ramp) // 2, adjust))]
         return (ANSI.seq_bg_color if is_bg else ANSI.seq_color).format(*new_rgb[:3])
 
     @staticmethod
-    def __get_replacement(format_key: str, default_color: rgba = None, brightness_steps: int = 20) -> str:
+    @lru_cache(maxsize=64)
+    def __get_brightness_ramp(default_color: tuple, brightness_steps: int) -> dict[int, tuple]:
+        """Computes all the lighter and darker versions of `default_color` at once, with the number of
+        `brightness_steps` as keys (all versions more steps away are the same as the last ones)."""
+        max_adjust = _math.ceil(100 / abs(brightness_steps)) if brightness_steps else 0
+        return {
+            adjust: (
+                tuple(Color.adjust_lightness(default_color, (brightness_steps / 100) * adjust)[:3])
+                if adjust
+                else default_color
+            )
+            for adjust in range(-max_adjust, max_adjust + 1)
+        }
+
+    @staticmethod
+    def __find_formats(string: str) -> Iterator[tuple[int, int, str, str | None, str | None]]:
+        """Finds all formatting codes `[…]` (with their optional auto-reset text `(…)`) inside the string in a single pass.\n
+        -------------------------------------------------------------------------------------------------------------------
+        This is a hand-written parser for exactly the same grammar as the `COMPILED["format"]` regex, which finds the same
+        matches as the regex would find in each line of the string, including the regex's backtracking behavior:
+        - formats `[…]` can contain nested brackets and quoted strings (`"…"` or `'…'`) which may contain brackets
+        - the auto-reset text `(…)` can contain quoted strings, one level of nested `(…)` and formats with auto-reset texts
+        - whitespace directly inside the brackets and between the `]`, an optional `/` or `\\` and the `(` is skipped\n
+        -------------------------------------------------------------------------------------------------------------------
+        Each found formatting code is yielded as a tuple of:
+        - its start and end index inside the string
+        - the formats inside the `[…]`
+        - the escape char (`/`, `\\` or an empty string) if it has an auto-reset text, otherwise `None`
+        - the auto-reset text inside the `(…)` if it has one, otherwise `None`"""
+        parser, pos, flat = _FormatParser(string), 0, COMPILED["flat_format"].match
+        while (pos := string.find("[", pos)) != -1:
+            if match := flat(string, pos):  # FAST PATH FOR FORMATS WITHOUT NESTED BRACKETS OR QUOTES
+                if match.group(4) or match.group(3) is None:
+                    yield pos, match.end(), match.group(1), match.group(2), match.group(3)
+                    pos = match.end()
+                    continue
+                formats_start, formats_end = match.start(1), match.end(1)
+            elif (close := string.find("]", pos)) == -1:  # NO FORMAT CAN END ANYMORE
+                return
+            elif (line_end := string.find("\n", pos, close)) != -1:  # NO FORMAT CAN END IN THE CURRENT LINE
+                pos = line_end + 1
+                continue
+            elif ends := parser.star(formats_start := parser.ws(string, pos + 1).end(), 0):
+                formats_end = ends[0]
+            else:
+                pos += 1
+                continue
+            escape, auto_reset_txt, end = parser.auto_reset(formats_end + 1)
+            yield pos, end, string[formats_start:formats_end], escape, auto_reset_txt
+            pos = end
+
+    @staticmethod
+    def cache_info() -> tuple[int, int, int, int]:
+        """Get the statistics `(hits, misses, maxsize, currsize)` of the cache, which is used
+        to look up the ANSI codes for format keys that are not in the fixed `ANSI_SEQ` table,
+        like RGB colors, HEX colors and keys depending on a `default_color`."""
+        return FormatCodes.__resolve_key.cache_info()
+
+    @staticmethod
+    def __sgr_transition(
+        state: dict[str, str], target: dict[str, str], as_keys: bool = True, full_reset: bool | None = False
+    ) -> list[str]:
+        """Gives you the shortest list of format keys (or SGR parameters if `as_keys` is false), which
+        change the terminal state from `state` to `target`.\n
+        -----------------------------------------------------------------------------------------------
+        Both states map the attributes (see `SGR_ATTRS`) to the format key (or parameters) which sets
+        them, `""` if the attribute is reset and unknown attributes are missing. With `full_reset=True`,
+        the result always starts with a total reset and with `full_reset=None` it never does."""
+        reset_codes = sorted({reset_code for attr, reset_code in SGR_ATTRS if target.get(attr) == "" != state.get(attr)})
+        changed = {attr for attr, _ in SGR_ATTRS if target.get(attr) and state.get(attr) != target[attr]}
+        changed |= {attr for attr, reset_code in SGR_ATTRS if reset_code in reset_codes and target.get(attr)}
+        params = [SGR_KEYS[code] if as_keys else str(code) for code in reset_codes]
+        params += [target[attr] for attr, _ in SGR_ATTRS if attr in changed]
+        if full_reset or (full_reset is not None and len(target) == len(SGR_ATTRS)):  # ALL ATTRIBUTES ARE KNOWN
+            full_params = ["_" if as_keys else "0"] + [target[attr] for attr, _ in SGR_ATTRS if target[attr]]
+            if full_reset or sum(map(len, full_params)) + len(full_params) < sum(map(len, params)) + len(params):
+                return full_params
+        return params
+
+    @staticmethod
+    def __get_replacement(
+        format_key: str, default_color: rgba = None, brightness_steps: int = 20, color_depth: str = "truecolor"
+    ) -> str:
         """Gives you the corresponding ANSI code for the given format key.
         If `default_color` is not `None`, the text color will be `default_color` if all formats
         are reset or you can get lighter or darker version of `default_color` (also as BG)"""
-        use_default = default_color and Color.is_valid_rgba(default_color, False)
+        if not default_color and (seq := ANSI_SEQ.get(format_key)):
+            return seq
+        return FormatCodes.__resolve_key(
+            format_key, tuple(default_color[:3]) if default_color else None, brightness_steps, color_depth
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=4096)
+    def __resolve_key(
+        format_key: str, default_color: tuple = None, brightness_steps: int = 20, color_depth: str = "truecolor"
+    ) -> str:
+        """Resolves the ANSI code for any format key, which isn't found directly in `ANSI_SEQ`.\n
+        ----------------------------------------------------------------------------------------
+        The results are cached, so every format key only has to be resolved once."""
+        return FormatCodes.__downsample(
+            FormatCodes.__resolve_rgb_key(format_key, default_color, brightness_steps), color_depth
+        )
+
+    @staticmethod
+    def __resolve_rgb_key(format_key: str, default_color: tuple = None, brightness_steps: int = 20) -> str:
+        """Resolves the ANSI code for the format key, with RGB colors as `38;2;r;g;b` or `48;2;r;g;b`."""
         _format_key, format_key = format_key, FormatCodes.__normalize_key(format_key)  # NORMALIZE KEY AND SAVE ORIGINAL
-        if use_default:
+        if default_color:
             if new_default_color := FormatCodes.__get_default_ansi(default_color, format_key, brightness_steps):
                 return new_default_color
-        for map_key in ANSI.codes_map:
-            if (isinstance(map_key, tuple) and format_key in map_key) or format_key == map_key:
-                return ANSI.seq().format(
-                    next(
-                        (
-                            v
-                            for k, v in ANSI.codes_map.items()
-                            if format_key == k or (isinstance(k, tuple) and format_key in k)
-                        ),
-                        None,
-                    )
-                )
+        if seq := ANSI_SEQ.get(format_key):
+            return seq
         rgb_match = _re.match(COMPILED["rgb"], format_key)
         hex_match = _re.match(COMPILED["hex"], format_key)
         try:
@@ -333,6 +1361,66 @@ class FormatCodes:
             pass
         return _format_key
 
+    @staticmethod
+    def __downsample(ansi_seq: str, color_depth: str) -> str:
+        """Converts an RGB color ANSI code to the nearest color of the given color depth."""
+        if color_depth in ("truecolor", "none") or not (match := COMPILED["rgb_seq"].fullmatch(ansi_seq)):
+            return ansi_seq
+        layer, r, g, b = map(int, match.groups())
+        color = FormatCodes.__get_color_table(color_depth)[(r >> 3) << 10 | (g >> 3) << 5 | b >> 3]
+        if color_depth == "256":
+            return ANSI.seq(3).format(layer, 5, color)
+        return ANSI.seq().format((30 if color < 8 else 82) + color + (10 if layer == 48 else 0))
+
+    @staticmethod
+    @lru_cache(maxsize=2)
+    def __get_color_table(color_depth: str) -> bytes:
+        """Builds the lookup table, which maps every RGB color quantized to 5 bits per channel
+        (`r >> 3 << 10 | g >> 3 << 5 | b >> 3`) to the nearest xterm 256 color or 16 color index."""
+        centers = [v << 3 | 4 for v in range(32)]
+        if color_depth == "16":  # COMPARE EACH COLOR TO ALL 16 COLORS, WITH THE SQUARED CHANNEL DIFFERENCES PRECOMPUTED
+            diffs = [[tuple((c - color[i]) ** 2 for color in XTERM_16) for c in centers] for i in range(3)]
+            table = bytearray()
+            for r in diffs[0]:
+                for g in diffs[1]:
+                    rg = tuple(map(_add, r, g))
+                    table += bytes(min(zip(map(_add, rg, b), range(16)))[1] for b in diffs[2])
+            return bytes(table)
+        levels, palette = (0, 95, 135, 175, 215, 255), XTERM_256
+        nearest_level = [min(range(6), key=lambda i: abs(levels[i] - v)) for v in range(256)]
+
+        def distance(rgb1: tuple, rgb2: tuple) -> int:
+            return (rgb1[0] - rgb2[0]) ** 2 + (rgb1[1] - rgb2[1]) ** 2 + (rgb1[2] - rgb2[2]) ** 2
+
+        def nearest_256(rgb: tuple) -> int:
+            cube = 16 + 36 * nearest_level[rgb[0]] + 6 * nearest_level[rgb[1]] + nearest_level[rgb[2]]
+            gray = 232 + min(23, max(0, round((sum(rgb) / 3 - 8) / 10)))
+            return min((cube, gray), key=lambda i: distance(palette[i], rgb))
+
+        return bytes(nearest_256((r, g, b)) for r in centers for g in centers for b in centers)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def __get_reset_keys(format_key: str) -> tuple[str, ...]:
+        """Gives you the format keys, which reset the given format key after an auto-reset text."""
+        k_lower = format_key.lower()
+        k_set = set(k_lower.split(":"))
+        if PREFIX["BG"] & k_set and len(k_set) <= 3:
+            for i in range(len(format_key)):
+                if FormatCodes.__is_valid_color(format_key[i:]):
+                    return ("_bg", "_color") if k_set & PREFIX["BR"] else ("_bg",)
+            return ()
+        elif FormatCodes.__is_valid_color(format_key) or any(
+            k_lower.startswith(pref_colon := f"{prefix}:") and FormatCodes.__is_valid_color(format_key[len(pref_colon) :])
+            for prefix in PREFIX["BR"]
+        ):
+            return ("_color",)
+        return (f"_{format_key}",)
+
+    @staticmethod
+    def __is_valid_color(color: str) -> bool:
+        return color in ANSI.color_map or Color.is_valid_rgba(color) or Color.is_valid_hexa(color)
+
     @staticmethod
     def __normalize_key(format_key: str) -> str:
         """Normalizes the given format key."""
@@ -342,6 +1430,4 @@ class FormatCodes:
             for prefix_key, prefix_values in PREFIX.items()
             if any(k_part in prefix_values for k_part in k_parts)
         )
-        return prefix_str + ":".join(
-            part for part in k_parts if part not in {val for values in PREFIX.values() for val in values}
-        )
+        return prefix_str + ":".join(part for part in k_parts if part not in PREFIXES)
@@ -7,13 +7,31 @@ Really long regex code presets:
 `func_call` match a function call
 `rgba_str` match an RGBA color
 `hsla_str` match a HSLA color
+`hexa_str` match a HEXA color\n
+All presets can also be gotten as cached, compiled pattern objects with `Regex.compiled()`.
 """
 
+from functools import lru_cache as _lru_cache
+import regex as _rx
 import re as _re
 
+REQUIRES_RX = {"quotes", "brackets", "func_call"}  # THE PRESETS, WHICH CAN ONLY BE COMPILED WITH `regex`
+
 
 class Regex:
 
+    @staticmethod
+    @_lru_cache(maxsize=None)
+    def compiled(name: str, **params) -> _re.Pattern | _rx.Pattern:
+        """Returns the preset `name` (e.g. `"rgba_str"`), built with the `params`, as compiled pattern object.\n
+        ------------------------------------------------------------------------------------------------------
+        The compiled pattern is cached, so calling this again with the same `name` and `params` just returns
+        the already compiled pattern. The presets, which require the non standard library `regex`, are
+        compiled with `regex`, all the other presets with the standard library `re`."""
+        if name.startswith("_") or name == "compiled" or not callable(preset := getattr(Regex, name, None)):
+            raise ValueError(f"Unknown regex preset '{name}'")
+        return (_rx if name in REQUIRES_RX else _re).compile(preset(**params))
+
     @staticmethod
     def quotes() -> str:
         """Matches everything inside quotes. (strings)\n
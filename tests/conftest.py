@@ -0,0 +1,25 @@
+from xulbux import xx_color
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption("--run-slow", action="store_true", help="also run the tests marked as slow")
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--run-slow"):
+        return
+    skip_slow = pytest.mark.skip(reason="slow, only runs with --run-slow")
+    for item in items:
+        if "slow" in item.keywords:
+            item.add_marker(skip_slow)
+
+
+@pytest.fixture(params=["numpy", "python"])
+def numpy_backend(request, monkeypatch):
+    """Runs the test once with NumPy (skipped if it's not installed) and once with the pure Python fallback."""
+    if request.param == "python":
+        monkeypatch.setattr(xx_color, "_np", None)
+    elif xx_color._np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
@@ -0,0 +1,51 @@
+import json
+import sys
+
+from xulbux import _bench_
+import pytest
+
+
+@pytest.fixture
+def stub_benchmarks(monkeypatch):
+    timings = {"results": {"short_log": 0.002, "document": 0.5}, "memory": {"rgba": 56.0}, "conversions": {"rgba": 1e-7}}
+    monkeypatch.setattr(_bench_, "run_benchmarks", lambda names, size, repeat: {n: timings["results"][n] for n in names})
+    monkeypatch.setattr(_bench_, "measure_memory", lambda: dict(timings["memory"]))
+    monkeypatch.setattr(_bench_, "measure_conversions", lambda: dict(timings["conversions"]))
+    return timings
+
+
+def run_command(monkeypatch, *args):
+    monkeypatch.setattr(sys, "argv", ["xx-bench", *args])
+    _bench_.bench_command()
+
+
+def test_compare():
+    results = {"short_log": 0.2, "document": 1.0, "new": 1.0}
+    assert _bench_.compare(results, {"short_log": 0.1, "document": 0.9}) == {"short_log": 2}
+    assert _bench_.compare(results, {"short_log": 0.1, "document": 0.9}, tolerance=1.5) == {}
+
+
+def test_bench_command(stub_benchmarks, monkeypatch, tmp_path, capsys):
+    baseline_file = tmp_path / "baseline.json"
+    run_command(monkeypatch, "--save", "--only", "short_log,document", "--baseline", str(baseline_file))
+    baseline = json.loads(baseline_file.read_text(encoding="utf-8"))
+    assert baseline["results"] == stub_benchmarks["results"] and baseline["memory"] == stub_benchmarks["memory"]
+    assert baseline["conversions"] == stub_benchmarks["conversions"] and "version" in baseline
+    run_command(monkeypatch, "--only", "short_log,document", "--baseline", str(baseline_file))
+    stub_benchmarks["results"]["document"] = 0.6
+    run_command(monkeypatch, "--only", "document", "--baseline", str(baseline_file), "--tolerance", "0.25")
+    with pytest.raises(SystemExit) as exit_info:
+        run_command(monkeypatch, "--only", "document", "--baseline", str(baseline_file))
+    assert exit_info.value.code == 1
+    with pytest.raises(SystemExit) as exit_info:
+        run_command(monkeypatch, "--only", "nope", "--baseline", str(baseline_file))
+    assert exit_info.value.code == 2
+    assert "nope" in capsys.readouterr().out
+
+
+@pytest.mark.slow
+def test_real_benchmarks():
+    results = _bench_.run_benchmarks(["short_log", "document"], size=0.01, repeat=1)
+    assert list(results) == ["short_log", "document"] and all(seconds > 0 for seconds in results.values())
+    assert list(_bench_.measure_memory(100)) == ["rgba", "hsla", "hexa"]
+    assert all(seconds > 0 for seconds in _bench_.measure_conversions(10, 1).values())
@@ -1,4 +1,4 @@
-from xulbux import Console
+from xulbux import Console, FormatCodes
 
 
 def test_console_user():
@@ -19,3 +19,15 @@ def test_console_height():
     assert isinstance(height_output, int)
     assert height_output != 0
     assert height_output >= 0
+
+
+def test_console_flushes_buffer(capsys, monkeypatch):
+    monkeypatch.setattr("builtins.input", lambda prompt: print(prompt, end="") or "y")
+    with FormatCodes.buffered(max_delay=60):
+        Console.log("INFO", "first")
+        Console.pause_exit(prompt="SECOND")
+        assert FormatCodes.strip_ansi(capsys.readouterr().out) == "   INFO: \tfirst\nSECOND"
+        Console.log("INFO", "third")
+        assert Console.confirm("fourth", end="")
+        output = FormatCodes.strip_ansi(capsys.readouterr().out)
+        assert output.index("third") < output.index("fourth")
@@ -1,4 +1,6 @@
-from xulbux import Color
+from xulbux import Color, Regex, ColorArray, rgba, hsla, hexa
+
+import pytest
 
 
 def test_rgba_to_hex_int_and_back():
@@ -16,3 +18,91 @@ def test_rgba_to_hex_int_and_back():
     assert Color.hex_int_to_rgba(_black) == (0, 0, 255, None)
     assert Color.hex_int_to_rgba(blue, preserve_original=True) == (1, 0, 255, None)
     assert Color.hex_int_to_rgba(black, preserve_original=True) == (1, 0, 0, 1.0)
+
+
+def test_conversions():
+    assert Color.to_rgba((0, 100, 50)) == rgba(255, 0, 0)
+    assert Color.to_rgba((200, 130, 40, 0.5)) == rgba(200, 130, 40, 0.5)
+    assert Color.to_hsla((0, 100, 50)) == rgba(0, 100, 50).to_hsla()
+    assert Color.to_rgba({"h": 0, "s": 100, "l": 50}) == rgba(255, 0, 0)
+    assert Color.to_hsla({"r": 255, "g": 0, "b": 0, "a": 0.5}) == hsla(0, 100, 50, 0.5)
+    assert Color.to_rgba("rgb(255, 0, 0)") == rgba(255, 0, 0)
+    assert Color.to_rgba("hsl(0, 100, 50)") == rgba(255, 0, 0)
+    assert Color.to_hexa("#FF0000") == hexa("#FF0000")
+    assert Color.to_hexa(0xFF0000) == hexa("#FF0000")
+    assert Color.to_rgba(hexa("#FF000080")) == rgba(255, 0, 0, 0.5)
+    for invalid in ((400, 0, 0), (0, 0), {"r": 0}, "#GG0000", "rgb(0, 0)", 1.5, None):
+        with pytest.raises(ValueError):
+            Color.to_rgba(invalid)
+
+
+def test_str_to_rgba():
+    assert Regex.compiled("rgba_str", allow_alpha=True) is Regex.compiled("rgba_str", allow_alpha=True)
+    assert Color.str_to_rgba("color: rgb(255, 0, 0) and (0, 0, 255, 0.5)", only_first=True) == rgba(255, 0, 0)
+    assert Color.str_to_rgba("color: rgb(255, 0, 0) and (0, 0, 255, 0.5)") == [rgba(255, 0, 0), rgba(0, 0, 255, 0.5)]
+    assert Color.str_to_rgba("no colors here") is None
+    with pytest.raises(ValueError):
+        Regex.compiled("unknown_preset")
+
+
+def test_iter_colors(tmp_path):
+    text = "a { color: rgb(255, 0, 0); background: #0000FF80 } b { color: HSLA(0, 100%, 50%, 0.5); x: rgb(300, 0, 0) }"
+    colors = list(Color.iter_colors(text))
+    assert colors == [
+        (rgba(255, 0, 0), (11, 25)),
+        (hexa("#0000FF80"), (39, 48)),
+        (hsla(0, 100, 50, 0.5), (62, 85)),
+    ]
+    assert [type(color) for color, _ in colors] == [rgba, hexa, hsla]
+    assert list(Color.iter_colors(text, formats=("hexa",))) == [(hexa("#0000FF80"), (39, 48))]
+    (file := tmp_path / "theme.css").write_text(text, encoding="utf-8")
+    assert list(Color.iter_colors(file)) == colors
+    with open(file, "rb") as f:
+        assert list(Color.iter_colors(f)) == colors
+    html = "<p>&#123; &#x41; issue#123 C#ABC</p> <b style='color:#ABC'>#123</b>"
+    assert list(Color.iter_colors(html)) == [(hexa("#ABC"), (53, 57)), (hexa("#123"), (59, 63))]
+    assert list(Color.iter_colors(html.encode())) == list(Color.iter_colors(html))
+    with pytest.raises(ValueError):
+        Color.iter_colors(text, formats=("cmyk",))  # FAILS AT THE CALL, NOT ONLY WHEN IT IS ITERATED
+
+
+def test_gradient(numpy_backend):
+    start, end = rgba(255, 0, 0), hexa("#0000FF")
+    gradient = Color.gradient(start, end, 5)
+    assert isinstance(gradient, ColorArray)
+    assert list(gradient) == [rgba(255, 0, 0), rgba(191, 0, 64), rgba(128, 0, 128), rgba(64, 0, 191), rgba(0, 0, 255)]
+    assert start == rgba(255, 0, 0) and end == hexa("#0000FF")
+    assert list(Color.gradient(start, end, 3, space="hsl")) == [rgba(255, 0, 0), rgba(255, 0, 255), rgba(0, 0, 255)]
+    assert list(Color.gradient(start, rgba(255, 0, 0, 0.5), 3)) == [
+        rgba(255, 0, 0, 1.0),
+        rgba(255, 0, 0, 0.75),
+        rgba(255, 0, 0, 0.5),
+    ]
+    stops = Color.gradient_stops([(0.5, "#FF0000"), (0.75, "#00FF00"), (1, "#0000FF")], 5)
+    assert list(stops) == [rgba(255, 0, 0), rgba(255, 0, 0), rgba(255, 0, 0), rgba(0, 255, 0), rgba(0, 0, 255)]
+    assert list(Color.gradient_stops(["#FF0000", "#00FF00", "#0000FF"], 3)) == [
+        rgba(255, 0, 0),
+        rgba(0, 255, 0),
+        rgba(0, 0, 255),
+    ]
+    with pytest.raises(ValueError):
+        Color.gradient_stops([(1, "#FF0000"), (0, "#0000FF")], 5)
+
+
+def test_contrast_ratio_many(numpy_backend):
+    colors = ["#000000", "#777777", rgba(255, 0, 0), hexa("#FFFFFF")]
+    luminances = Color.luminance_many(ColorArray(colors))
+    assert list(luminances) == [Color.luminance(*Color.to_rgba(color)[:3], float) for color in colors]
+    assert list(Color.luminance_many(colors)) == list(luminances)
+    ratios, aa, aaa = Color.contrast_ratio_many(colors, "#FFFFFF")
+    assert [round(ratio, 2) for ratio in ratios] == [21.0, 4.48, 4.0, 1.0]
+    assert list(aa) == [True, False, False, False] and list(aaa) == [True, False, False, False]
+    _, aa_large, _ = Color.contrast_ratio_many(colors, "#FFFFFF", large_text=True)
+    assert list(aa_large) == [True, True, True, False]
+    ratios, _, _ = Color.contrast_ratio_many(["#000000", "#FFFFFF"], ColorArray(["#FFFFFF", "#000000"]))
+    assert list(ratios) == [21.0, 21.0]
+    with pytest.raises(ValueError):
+        Color.contrast_ratio_many(colors, colors[:2])
+    assert list(Color.luminance_many([])) == [] and list(Color.luminance_many(ColorArray([]))) == []
+    for fg, bg in (([], []), ([], "#FFFFFF"), (ColorArray([]), [])):
+        assert [list(result) for result in Color.contrast_ratio_many(fg, bg)] == [[], [], []]
@@ -1,4 +1,7 @@
-from xulbux import rgba, hexa, hsla
+from xulbux import rgba, hexa, hsla, ColorArray, Palette, xx_color
+
+import pickle
+import pytest
 
 
 # ! DONT'T CHANGE VALUES ! #
@@ -98,3 +101,76 @@ def test_hexa_return_values():
     assert hexa(clr_hexa).is_opaque() is False
     assert_hexa_equal(hexa(clr_hexa).with_alpha(0.75), "#FF0000BF")
     assert_hexa_equal(hexa(clr_hexa).complementary(), "#00FFFF7F")
+
+
+def test_immutable_and_hashable():
+    for color in (rgba(*clr_rgba), hsla(*clr_hsla), hexa(clr_hexa), hexa("#FF000000")):
+        with pytest.raises(AttributeError):
+            color.a = 1.0
+        assert not hasattr(color, "__dict__")
+        assert pickle.loads(pickle.dumps(color)) == color
+        assert hash(pickle.loads(pickle.dumps(color))) == hash(color)
+    color = rgba(*clr_rgba)
+    assert color.lighten(0.5) == rgba(255, 128, 128, 0.5) and color == rgba(*clr_rgba)
+    assert len({rgba(*clr_rgba), rgba(*clr_rgba), rgba(255, 0, 0), hexa(clr_hexa), hexa("#ff00007f")}) == 3
+    assert rgba(1, 2, 3) != rgba(1, 2, 3, 0.5) and rgba(1, 2, 3) != (1, 2, 3)
+
+
+def test_from_int():
+    assert_rgba_equal(rgba.from_int(0xFF00007F), (255, 0, 0, 127 / 255))
+    assert_hexa_equal(hexa.from_int(0xFF00007F), "#FF00007F")
+    assert rgba.from_int(0x0100FF) == rgba(0, 0, 255) and hexa.from_int(0x0100FF) == hexa("#0000FF")
+    assert rgba.from_int(0x0100FF, preserve_original=True) == rgba(1, 0, 255)
+    assert hexa.from_int(0xFF0000FF).to_rgba() == rgba(255, 0, 0, 1.0)
+
+
+def test_color_array(numpy_backend):
+    colors = [rgba(*clr_rgba), rgba(0, 0, 255), rgba(54, 54, 54, 1.0)]
+    array = ColorArray([rgba(*clr_rgba), "#0000FF", hexa("#363636FF")])
+    assert len(array) == 3 and list(array) == colors and array[1] == colors[1] and list(array[::2]) == colors[::2]
+    assert array.to_hsla() == [color.to_hsla() for color in colors]
+    assert array.to_hexa() == [color.to_hexa() for color in colors]
+    for method, args in (("lighten", (0.5,)), ("darken", (0.3,)), ("desaturate", (0.5,)), ("rotate", (-90,))):
+        assert list(getattr(array, method)(*args)) == [getattr(color, method)(*args) for color in colors]
+    assert list(array.invert()) == [color.invert() for color in colors]
+    assert list(array.grayscale()) == [color.grayscale() for color in colors]
+    assert list(array.blend((0, 255, 0))) == [color.blend((0, 255, 0)) for color in colors]
+    assert list(array.blend(array.invert(), 0.25, True)) == [c.blend(c.invert(), 0.25, True) for c in colors]
+    assert list(array.luminance()) == [54, 18, 9] and list(array.is_dark()) == [True, True, True]
+
+
+def test_conversion_cache():
+    xx_color._rgb_to_hsl.cache_clear()
+    for _ in range(3):
+        assert_hsla_equal(rgba(*clr_rgba).to_hsla(), clr_hsla)
+        assert_rgba_equal(hsla(*clr_hsla).to_rgba(), clr_rgba)
+    assert xx_color._rgb_to_hsl.cache_info().hits == 2
+    assert xx_color._rgb_to_hsl.cache_info().maxsize == xx_color.CONVERSION_CACHE_SIZE
+
+
+def test_palette():
+    colors = [rgba(255, 0, 0), hexa("#00FF00"), rgba(0, 0, 255), hexa("#FF0000"), rgba(250, 10, 10)]
+    palette = Palette(colors)
+    assert len(palette) == 5 and list(palette) == colors
+    assert palette.nearest(rgba(255, 0, 0), 3) == [(0, colors[0], 0), (3, colors[3], 0), (4, colors[4], 15)]
+    assert palette.within(rgba(0, 0, 255), 0) == [(2, colors[2], 0)]
+    assert [key for key, _, _ in palette.within(rgba(200, 0, 0), 60)] == [4, 0, 3]
+    names = Palette({"red": "#FF0000", "green": "#00FF00", "blue": "#0000FF"}, space="lab")
+    assert names.nearest(hexa("#0000C0"))[0][0] == "blue"
+    with pytest.raises(ValueError):
+        palette.nearest(rgba(0, 0, 0), 0)
+
+
+def test_hexa_interning():
+    hexa.set_cache_size(2)
+    try:
+        assert hexa("#ff0000") is hexa("FF0000") is hexa("0xFF0000")
+        assert hexa.from_int(0xFF0000) is hexa(0xFF0000) and hexa.from_int(0xFF0000) == hexa("#FF0000")
+        assert hexa.cache_info().hits == 5 and hexa.cache_info().currsize == 2
+        red = hexa("#FF0000")
+        hexa("#00FF00"), hexa("#0000FF")
+        assert hexa("#FF0000") is not red and hexa("#FF0000") == red
+        hexa.set_cache_size(0)
+        assert hexa("#FF0000") is not hexa("#FF0000") and hexa.cache_info().currsize == 0
+    finally:
+        hexa.set_cache_size(xx_color.HEXA_CACHE_SIZE)
@@ -1,6 +1,10 @@
+import concurrent.futures
+import random
+import io
+
 from xulbux._consts_ import ANSI
 from xulbux import FormatCodes
-
+import pytest
 
 black = ANSI.seq_color.format(0, 0, 0)
 bg_red = f"{ANSI.char}{ANSI.start}{ANSI.codes_map['bg:red']}{ANSI.end}"
@@ -40,3 +44,219 @@ def test_codes_to_ansi():
         + "!"
         + reset
     )
+
+
+def test_compiled_template():
+    template = FormatCodes.compile("[b|#000](Hello {name}) [i]{count:>3}[_] {{braces}}", default_color="#FFF")
+    assert template.is_static
+    for name, count in (("world", 1), ("there", 42)):
+        expected = FormatCodes.to_ansi(f"[b|#000](Hello {name}) [i]{count:>3}[_] {{braces}}", default_color="#FFF")
+        assert template.format(name=name, count=count) == expected
+        assert template.render(name, count) == expected
+    dynamic = FormatCodes.compile("[{color}]colored[_]")
+    assert not dynamic.is_static
+    assert dynamic.format(color="bg:red") == f"{bg_red}colored{reset}"
+    for string in ("[b]{x}(note) end", "[b] {x} / {y}(note) end", "[b]{x}\n(note)"):
+        template = FormatCodes.compile(string)
+        assert not template.is_static
+        for x, y in (("", ""), ("  ", " "), ("/", ""), ("text", "")):
+            assert template.format(x=x, y=y) == FormatCodes.to_ansi(string.format(x=x, y=y))
+    assert FormatCodes.compile("[b]{x}. (note)").is_static
+    for string, values in (
+        ("[b]({a}) x", [{"a": a} for a in ("(", ")", "a)b", "((c)", "'", "", " d ", "plain")]),
+        ("[b]({v:{w}}) {}|{:>{}}", [{"v": v, "w": w} for v in ("(", "e") for w in ("3", "(<3", "")]),
+    ):
+        template = FormatCodes.compile(string)
+        assert template.is_static
+        for kwargs in values:
+            expected = FormatCodes.to_ansi(string.format(7, "x", 3, **kwargs))
+            assert template.format(7, "x", 3, **kwargs) == expected
+            if "w" in kwargs:
+                assert template.render(kwargs["v"], kwargs["w"], 7, "x", 3) == expected
+
+
+def test_cache_info():
+    FormatCodes.to_ansi("[#F87]cached[_]")
+    hits = FormatCodes.cache_info().hits
+    assert FormatCodes.to_ansi("[#F87]cached[_]") == f"{orange}cached{reset}"
+    assert FormatCodes.cache_info().hits == hits + 1
+    assert FormatCodes.cache_info().currsize <= FormatCodes.cache_info().maxsize
+
+
+def test_engines():
+    strings = [
+        "[b|#000|bg:red](He[in](l)lo) [[i|u|#F87](world)][default]![_]",
+        "[b] / ( x ) [i]/(y [u](z)) [bg:red]\\(\"(q)\" 'a]b')[_]",
+        '[ [b](nested) ] ["]"|b](x) [b](unclosed [i]( [b]\n(next line)',
+        "[b](a(b[i](c))d) [b](a[i]b) [*|*color](x) [b]((deep)) [#F87]",
+    ]
+    rng = random.Random(0)
+    atoms = ["[", "]", "(", ")", "/", "\\", '"', "'", " ", "\n", "b", "|", "#F87", "[i]", "[u](", "bg:red"]
+    strings += ["".join(rng.choice(atoms) for _ in range(rng.randint(1, 30))) for _ in range(500)]
+    for string in strings:
+        for default_color in (None, "#FFF"):
+            assert FormatCodes.to_ansi(string, default_color, engine="fast") == FormatCodes.to_ansi(
+                string, default_color, engine="regex"
+            )
+
+
+def test_iter_ansi():
+    text = "[b|#000|bg:red](He[in](l)lo)\n[[i|u|#F87](world)]\n[default]![_] [x\n*] [*color](end)"
+    for size in (1, 2, 5, len(text)):
+        chunks = [text[i : i + size] for i in range(0, len(text), size)]
+        assert "".join(FormatCodes.iter_ansi(chunks, "#FFF")) == FormatCodes.to_ansi(text, "#FFF")
+        assert "".join(FormatCodes.iter_ansi(io.StringIO(text), chunk_size=size)) == FormatCodes.to_ansi(text)
+    output = io.StringIO()
+    with FormatCodes.Stream(output) as stream:
+        stream.write("plain [b")
+        assert output.getvalue() == "plain "
+        stream.write("](bold)\n[i]")
+        assert output.getvalue() == f"plain {bold}bold{reset_bold}\n"
+    assert output.getvalue() == f"plain {bold}bold{reset_bold}\n{italic}"
+
+
+class FakeTimer:
+    started = []
+
+    def __init__(self, interval, function):
+        self.interval, self.function, self.daemon, self.cancelled = interval, function, False, False
+        FakeTimer.started.append(self)
+
+    def start(self):
+        pass
+
+    def cancel(self):
+        self.cancelled = True
+
+
+def test_buffered(monkeypatch):
+    monkeypatch.setattr(FormatCodes.Buffer, "timer", FakeTimer)
+    output = io.StringIO()
+    with FormatCodes.buffered(max_bytes=10, max_delay=60, file=output) as buffer:
+        assert FormatCodes.Buffer.active is buffer
+        buffer.write("12345")
+        assert output.getvalue() == ""
+        buffer.write("67890")
+        assert output.getvalue() == "1234567890"
+        buffer.write("abc")
+        buffer.flush()
+        assert output.getvalue() == "1234567890abc"
+        buffer.write("def")
+    assert FormatCodes.Buffer.active is None
+    assert output.getvalue() == "1234567890abcdef"
+    with FormatCodes.buffered(max_delay=0, file=output) as buffer:
+        buffer.write("!")
+        assert output.getvalue() == "1234567890abcdef!"
+    FakeTimer.started.clear()
+    with FormatCodes.buffered(max_delay=60, file=output) as buffer:
+        buffer.write("?")
+        buffer.write("?")
+        assert output.getvalue() == "1234567890abcdef!" and len(FakeTimer.started) == 1
+        timer = FakeTimer.started[0]
+        assert timer.interval == 60 and timer.daemon
+        timer.function()  # THE TIMER RUNS OUT, WITHOUT ANY MORE WRITES
+        assert output.getvalue() == "1234567890abcdef!??" and timer.cancelled
+        buffer.write("!")
+        assert len(FakeTimer.started) == 2
+    assert output.getvalue() == "1234567890abcdef!??!" and FakeTimer.started[1].cancelled
+
+
+def test_print(capsys):
+    FormatCodes.print("[b](bold) [i]italic", end="[_]\n")
+    assert capsys.readouterr().out == f"{bold}bold{reset_bold} {italic}italic{reset}\n"
+    support = FormatCodes.terminal_support()
+    assert support["color_depth"] in ("truecolor", "256", "16", "none")
+    assert support["truecolor"] == (support["color_depth"] == "truecolor")
+
+
+def test_color_depth():
+    string = "[b|#F00|bg:#00F](red on blue) [#FFF]white[_]"
+    assert FormatCodes.to_ansi(string, color_depth="256") == (
+        f"{bold}\x1b[38;5;196m\x1b[48;5;21mred on blue{reset_bold}{reset_color}{reset_bg} \x1b[38;5;231mwhite{reset}"
+    )
+    assert FormatCodes.to_ansi(string, color_depth="16") == (
+        f"{bold}\x1b[91m\x1b[44mred on blue{reset_bold}{reset_color}{reset_bg} \x1b[97mwhite{reset}"
+    )
+    assert FormatCodes.to_ansi("[#040474]x", color_depth="16") == "\x1b[30mx"  # NEARER TO BLACK THAN TO BLUE
+    assert FormatCodes.to_ansi(string, color_depth="none") == "red on blue white"
+    assert FormatCodes.to_ansi("[*]x [i]/(y)", default_color="#FFF", color_depth="none") == "x (y)"
+
+
+def test_strip_ansi_and_visible_len():
+    ansi = FormatCodes.to_ansi("[b|#F87](Hello) [bg:red]world[_] [x]", default_color="#FFF")
+    assert FormatCodes.strip_ansi(ansi) == "Hello world [x]"
+    assert FormatCodes.strip_ansi("\x1b]0;title\x07plain\x1b(B") == "plain"
+    assert FormatCodes.remove_formatting("[b|#F87](Hello) [bg:red]world[_] [x]", "#FFF") == "Hello world [x]"
+    assert FormatCodes.visible_len(ansi) == 15
+    assert FormatCodes.visible_len(f"{bold}日本語{reset} é") == 8
+
+
+def test_brightness_modifiers():
+    ramp = FormatCodes.get_brightness_ramp("#808080", 25)
+    assert [tuple(ramp[i]) for i in (-1, 0, 1)] == [(63, 63, 63), (128, 128, 128), (191, 191, 191)]
+    assert max(ramp) == 4 and tuple(ramp[4]) == (255, 255, 255)
+    flat = FormatCodes.get_brightness_ramp("#888", 0)
+    assert list(flat) == [0] and tuple(flat[0]) == (136, 136, 136)
+    gray = ANSI.seq_color.format(128, 128, 128)
+    assert FormatCodes.to_ansi("[l]a[ll]b[+++]c", "#808080", 25) == (
+        f"{gray}{ANSI.seq_color.format(191, 191, 191)}a{ANSI.seq_color.format(255, 255, 255)}b"
+        f"{ANSI.seq_color.format(255, 255, 255)}c"
+    )
+    assert FormatCodes.to_ansi("[BG:d]a[--]b", "#808080", 25) == (
+        f"{gray}{ANSI.seq_bg_color.format(63, 63, 63)}a{ANSI.seq_color.format(0, 0, 0)}b"
+    )
+
+
+def test_theme(capsys):
+    theme = FormatCodes.Theme(default_color="#FFF")
+    for string in ("[b|#000|bg:red](He[in](l)lo) [[i|u|#F87](world)][default]![_]", "[*]x [*color](y) no star"):
+        assert theme.to_ansi(string) == FormatCodes.to_ansi(string, default_color="#FFF")
+    theme.print("[b](bold)", "[*]")
+    assert capsys.readouterr().out == f"{default}{bold}bold{reset_bold} {reset}{default}\n"
+
+
+def test_parallel_conversion(monkeypatch):
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", concurrent.futures.ThreadPoolExecutor)  # IN-PROCESS
+    strings = ["[b|#000|bg:red](He[in](l)lo) [[i|u|#F87](world)]", "[*]x [x\n*] [*color](y)", "plain", ""]
+    for workers in (1, 3):
+        assert FormatCodes.to_ansi_many(strings * 5, "#FFF", workers=workers) == [
+            FormatCodes.to_ansi(s, "#FFF") for s in strings * 5
+        ]
+    document = "\n".join(strings * 20)
+    for default_color in (None, "#FFF"):
+        expected = FormatCodes.to_ansi(document, default_color)
+        for workers, chunk_size in ((1, 10), (1, 100), (3, 10), (3, 1 << 20)):
+            assert FormatCodes.to_ansi_chunked(document, default_color, workers=workers, chunk_size=chunk_size) == expected
+    assert FormatCodes.to_ansi_chunked("", workers=3) == ""
+
+
+@pytest.mark.slow
+def test_parallel_conversion_processes():
+    strings = ["[b|#000|bg:red](He[in](l)lo)", "[*]x [*color](y)", "plain"]
+    assert FormatCodes.to_ansi_many(strings, "#FFF", workers=2) == [FormatCodes.to_ansi(s, "#FFF") for s in strings]
+
+
+def test_from_ansi():
+    ansi = FormatCodes.to_ansi("[b|#000|bg:red](He[in](l)lo) [i|u|#F87](world) [dim]x[_dim][b][b](y)[_]")
+    assert FormatCodes.from_ansi(ansi) == "[b|#000|bg:red]He[in]l[_in]lo[_] [i|u|#F87]world[_] [dim]x[_|b]y[_]"
+    assert FormatCodes.strip_ansi(FormatCodes.to_ansi(FormatCodes.from_ansi(ansi))) == FormatCodes.strip_ansi(ansi)
+    assert (
+        FormatCodes.from_ansi("\x1b[38;5;196;1m(x) \x1b[5;48;2;17;34;51m (y)\x1b[0m")
+        == "[b|#F00]/(x) [bg:#123] [bg:#123]/(y)[_]"
+    )
+    assert FormatCodes.to_ansi("[b|#F00]/(x) [bg:#123] [bg:#123]/(y)[_]") == (
+        f"{bold}\x1b[38;2;255;0;0m(x) \x1b[48;2;17;34;51m \x1b[48;2;17;34;51m(y){reset}"
+    )
+    assert FormatCodes.from_ansi("plain \x1b]0;title\x07text") == "plain \x1b]0;title\x07text"
+
+
+def test_optimize():
+    assert FormatCodes.to_ansi("[b][b][#F00][#F00]x", optimize=True) == "\x1b[1;38;2;255;0;0mx"
+    assert FormatCodes.to_ansi("[#F00](a [b](x)) [_c][#0F0]z", optimize=True) == (
+        "\x1b[38;2;255;0;0ma \x1b[1mx\x1b[22;39m \x1b[38;2;0;255;0mz"
+    )
+    assert FormatCodes.optimize_ansi("\x1b[0m\x1b[1ma\x1b[22m\x1b[0mb\x1b[5m\x1b[0mc") == "\x1b[0;1ma\x1b[0mb\x1b[5m\x1b[0mc"
+    assert FormatCodes.optimize_ansi("\x1b[31m\x1b[38;2;1;2;3;1m\x1b[1mx\x1b[m") == "\x1b[1;38;2;1;2;3mx\x1b[0m"
+    assert FormatCodes.optimize_ansi("\x1b[31m\x1b[38;2;1;2;3;1m\x1b[1m\x1b[m") == "\x1b[0m"
+    ansi = FormatCodes.to_ansi("[b|#000|bg:red](He[in](l)lo) [[i|u|#F87](world)][_]", default_color="#FFF")
+    assert FormatCodes.strip_ansi(FormatCodes.optimize_ansi(ansi)) == FormatCodes.strip_ansi(ansi)